@@ -0,0 +1,415 @@
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+import numpy as np
+from app.models.news_models import BiasAnalysis, NewsCluster, NewsSource, NewsSummary, RawArticle, SnapshotArticle
+
+logger = logging.getLogger(__name__)
+
+
+def to_micros(value: datetime) -> int:
+    return int(value.timestamp()) * 1_000_000 + value.microsecond
+
+
+def from_micros(micros: int) -> datetime:
+    return datetime.fromtimestamp(micros // 1_000_000).replace(microsecond=micros % 1_000_000)
+
+
+class StringInterner:
+    """Maps repeated strings (source names, categories, tones) to small integer codes"""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def value(self, code: int) -> str:
+        return self.values[code]
+
+
+class ClusterRecord:
+    """Compact in-memory form of a processed cluster; article data lives in the ArticleTable"""
+
+    __slots__ = ('id', 'category', 'title', 'summary', 'differing_narratives', 'created_at', 'rows')
+
+    def __init__(
+        self,
+        id: str,
+        category: int,
+        title: str,
+        summary: str,
+        differing_narratives: Optional[str],
+        created_at: int,
+        rows: np.ndarray
+    ):
+        self.id = id
+        self.category = category
+        self.title = title
+        self.summary = summary
+        self.differing_narratives = differing_narratives
+        self.created_at = created_at  # microseconds since the epoch
+        self.rows = rows  # int32 row indices into the ArticleTable
+
+
+class ArticleTable:
+    """Columnar storage for article sources, sentiment and embeddings.
+
+    Fixed-width columns are numpy arrays grown by a quarter at a time and
+    shrunk again on compaction; URLs and external ids are the only per-row
+    Python objects. Embeddings share one contiguous float16 matrix.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.size = 0
+        self.capacity = capacity
+        self.min_capacity = capacity
+        self.source = np.zeros(capacity, dtype=np.int32)
+        self.source_type = np.zeros(capacity, dtype=np.int16)
+        self.category = np.zeros(capacity, dtype=np.int16)
+        self.timestamp = np.zeros(capacity, dtype=np.int64)  # seconds since the epoch (publish time)
+        self.compound = np.zeros(capacity, dtype=np.float64)
+        self.sentiment = np.zeros(capacity, dtype=np.int16)
+        self.tone = np.zeros(capacity, dtype=np.int16)
+        self.has_embedding = np.zeros(capacity, dtype=bool)
+        self.embeddings: Optional[np.ndarray] = None
+        self.urls: List[str] = []
+        self.external_ids: List[Optional[str]] = []
+
+    COLUMNS = ('source', 'source_type', 'category', 'timestamp', 'compound', 'sentiment', 'tone', 'has_embedding')
+
+    def reserve(self, extra: int):
+        needed = self.size + extra
+        if needed > self.capacity:
+            self.resize(max(needed, self.capacity + self.capacity // 4))
+
+    def resize(self, capacity: int):
+        """Reallocate the columns to ``capacity`` rows (at least ``size``)"""
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            resized = np.zeros(capacity, dtype=column.dtype)
+            resized[:self.size] = column[:self.size]
+            setattr(self, name, resized)
+        if self.embeddings is not None:
+            resized = np.zeros((capacity, self.embeddings.shape[1]), dtype=np.float16)
+            resized[:self.size] = self.embeddings[:self.size]
+            self.embeddings = resized
+        self.capacity = capacity
+
+    def set_embedding(self, row: int, vector: np.ndarray):
+        if self.embeddings is None:
+            self.embeddings = np.zeros((self.capacity, vector.shape[0]), dtype=np.float16)
+        if vector.shape[0] != self.embeddings.shape[1]:
+            return
+        self.embeddings[row] = vector
+        self.has_embedding[row] = True
+
+    def compact(self, live_rows: np.ndarray) -> np.ndarray:
+        """Keep only ``live_rows`` (sorted); returns the old-row -> new-row mapping"""
+        mapping = np.full(self.size, -1, dtype=np.int32)
+        mapping[live_rows] = np.arange(len(live_rows), dtype=np.int32)
+
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:len(live_rows)] = column[live_rows]
+        if self.embeddings is not None:
+            self.embeddings[:len(live_rows)] = self.embeddings[live_rows]
+        self.urls = [self.urls[row] for row in live_rows]
+        self.external_ids = [self.external_ids[row] for row in live_rows]
+        self.size = len(live_rows)
+
+        # Give back what compaction freed, keeping some headroom for the next refresh
+        capacity = max(self.min_capacity, self.size + self.size // 4)
+        if capacity < self.capacity:
+            self.resize(capacity)
+        return mapping
+
+    def embedding_nbytes(self) -> int:
+        return self.embeddings.nbytes if self.embeddings is not None else 0
+
+    def nbytes(self) -> int:
+        """Allocated bytes, including unused capacity and the per-row Python strings"""
+        total = sum(getattr(self, name).nbytes for name in self.COLUMNS) + self.embedding_nbytes()
+        total += sys.getsizeof(self.urls) + sum(sys.getsizeof(url) for url in self.urls)
+        total += sys.getsizeof(self.external_ids)
+        return total + sum(sys.getsizeof(item) for item in self.external_ids if item is not None)
+
+
+class ArticleStore:
+    """Retained clusters per category, backed by a shared columnar ArticleTable.
+
+    Pydantic models are only built on the way out (``news_clusters``) and on
+    the way in from shared snapshots (``load_news_clusters``). Records returned
+    by ``add_cluster`` stay pending until they are published with
+    ``set_clusters`` or released with ``discard``; compaction keeps their rows.
+    """
+
+    def __init__(self):
+        self.table = ArticleTable()
+        self.strings = StringInterner()
+        self.clusters: Dict[str, List[ClusterRecord]] = {}
+        self.pending: Set[ClusterRecord] = set()
+        self.dead_rows = 0
+
+    def has_category(self, category: str) -> bool:
+        return category in self.clusters
+
+    def records(self, category: str) -> List[ClusterRecord]:
+        return self.clusters.get(category, [])
+
+    def add_cluster(
+        self,
+        category: str,
+        cluster_id: str,
+        summary_data: Dict,
+        articles: List[RawArticle],
+        bias_analyses: List[BiasAnalysis],
+        embeddings: Optional[np.ndarray] = None,
+        created_at: Optional[datetime] = None
+    ) -> ClusterRecord:
+        """Append a cluster's articles to the table and return its record (not yet published)"""
+        table = self.table
+        table.reserve(len(articles))
+        category_code = self.strings.intern(category)
+
+        start = table.size
+        for offset, (article, bias) in enumerate(zip(articles, bias_analyses)):
+            row = start + offset
+            table.source[row] = self.strings.intern(article.source)
+            table.source_type[row] = self.strings.intern(article.source_type)
+            table.category[row] = category_code
+            table.timestamp[row] = int(article.timestamp.timestamp())
+            table.compound[row] = bias.compound
+            table.sentiment[row] = self.strings.intern(bias.sentiment)
+            table.tone[row] = self.strings.intern(bias.tone)
+            table.has_embedding[row] = False
+            table.urls.append(article.url)
+            table.external_ids.append(article.external_id)
+            if embeddings is not None:
+                table.set_embedding(row, embeddings[offset])
+        table.size = start + len(articles)
+
+        record = ClusterRecord(
+            id=cluster_id,
+            category=category_code,
+            title=summary_data.get('title') or articles[0].title,
+            summary=summary_data.get('summary') or '',
+            differing_narratives=summary_data.get('differing_narratives'),
+            created_at=to_micros(created_at or datetime.now()),
+            rows=np.arange(start, table.size, dtype=np.int32)
+        )
+        self.pending.add(record)
+        return record
+
+    def extend_cluster(
+        self,
+        record: ClusterRecord,
+        articles: List[RawArticle],
+        bias_analyses: List[BiasAnalysis],
+        embeddings: Optional[np.ndarray] = None
+    ) -> ClusterRecord:
+        """Pending copy of a cluster with more articles appended; the summary is kept"""
+        added = self.add_cluster(
+            self.strings.value(record.category),
+            record.id,
+            {'title': record.title, 'summary': record.summary, 'differing_narratives': record.differing_narratives},
+            articles,
+            bias_analyses,
+            embeddings
+        )
+        added.rows = np.concatenate([record.rows, added.rows])
+        return added
+
+    def unreferenced_rows(self, released: List[ClusterRecord], live: List[ClusterRecord]) -> int:
+        """Rows of ``released`` records that no ``live`` record shares (extended clusters share rows)"""
+        if not released:
+            return 0
+        rows = np.concatenate([record.rows for record in released])
+        if live:
+            rows = np.setdiff1d(rows, np.concatenate([record.rows for record in live]))
+        return len(rows)
+
+    def set_clusters(self, category: str, records: List[ClusterRecord]):
+        """Publish the clusters of a category; rows of dropped clusters are reclaimed lazily"""
+        kept = {id(record) for record in records}
+        dropped = [record for record in self.clusters.get(category, []) if id(record) not in kept]
+        self.dead_rows += self.unreferenced_rows(dropped, records)
+        self.clusters[category] = records
+        self.pending.difference_update(records)
+
+        if self.dead_rows > max(self.table.min_capacity, self.table.size // 4):
+            self.compact()
+
+    def discard(self, records: List[ClusterRecord]):
+        """Release records that were appended but will never be published"""
+        released = [record for record in records if record in self.pending]
+        self.pending.difference_update(released)
+        live = [record for records in self.clusters.values() for record in records]
+        self.dead_rows += self.unreferenced_rows(released, live + list(self.pending))
+
+    def compact(self):
+        """Drop rows no published or pending record refers to"""
+        all_records = [record for records in self.clusters.values() for record in records]
+        all_records.extend(self.pending)
+        # Remap each record once, even if it is listed twice
+        all_records = list({id(record): record for record in all_records}.values())
+        live_rows = np.unique(np.concatenate([record.rows for record in all_records])) if all_records \
+            else np.zeros(0, dtype=np.int32)
+        mapping = self.table.compact(live_rows)
+        for record in all_records:
+            record.rows = mapping[record.rows]
+        self.dead_rows = 0
+        logger.info(f"Compacted article table to {self.table.size} rows ({self.nbytes()} bytes)")
+
+    def nbytes(self) -> int:
+        """Bytes held by the table, the interned strings and the cluster records"""
+        records = {id(record): record for records in self.clusters.values() for record in records}
+        records.update((id(record), record) for record in self.pending)
+
+        total = self.table.nbytes()
+        total += sys.getsizeof(self.strings.values) + sys.getsizeof(self.strings.codes)
+        total += sum(sys.getsizeof(value) for value in self.strings.values)
+        total += sys.getsizeof(self.clusters) + sum(sys.getsizeof(records) for records in self.clusters.values())
+        for record in records.values():
+            total += sys.getsizeof(record) + sys.getsizeof(record.rows)
+            total += sys.getsizeof(record.id) + sys.getsizeof(record.title) + sys.getsizeof(record.summary)
+            if record.differing_narratives is not None:
+                total += sys.getsizeof(record.differing_narratives)
+        return total
+
+    def embeddings(self, record: ClusterRecord) -> Optional[np.ndarray]:
+        """float16 embeddings of the record's articles, or None if any are missing"""
+        table = self.table
+        if table.embeddings is None or not table.has_embedding[record.rows].all():
+            return None
+        return table.embeddings[record.rows]
+
+    def centroid(self, record: ClusterRecord) -> Optional[np.ndarray]:
+        """Mean float32 embedding of the record's embedded articles, or None if it has none"""
+        table = self.table
+        if table.embeddings is None:
+            return None
+        rows = record.rows[table.has_embedding[record.rows]]
+        if not len(rows):
+            return None
+        return table.embeddings[rows].astype(np.float32).mean(axis=0)
+
+    def to_news_cluster(self, record: ClusterRecord) -> NewsCluster:
+        table = self.table
+        value = self.strings.value
+        category = value(record.category)
+        created_at = from_micros(record.created_at).isoformat()
+
+        bias_analysis = []
+        sources = []
+        for row in record.rows:
+            source = value(table.source[row])
+            bias_analysis.append(BiasAnalysis(
+                source=source,
+                sentiment=value(table.sentiment[row]),
+                compound=float(table.compound[row]),
+                tone=value(table.tone[row])
+            ))
+            sources.append(NewsSource(name=source, url=table.urls[row], type=value(table.source_type[row])))
+
+        news_summary = NewsSummary(
+            id=f"{record.id}_summary",
+            title=record.title,
+            summary=record.summary,
+            differing_narratives=record.differing_narratives,
+            bias_analysis=bias_analysis,
+            sources=sources,
+            category=category,
+            timestamp=created_at,
+            cluster_id=record.id
+        )
+        return NewsCluster(
+            id=record.id,
+            topic=record.title,
+            articles=[news_summary],
+            last_updated=created_at
+        )
+
+    def news_clusters(self, category: str) -> List[NewsCluster]:
+        return [self.to_news_cluster(record) for record in self.records(category)]
+
+    def snapshot_articles(self, category: str) -> Dict[str, List[SnapshotArticle]]:
+        """Per-source fields that snapshots carry next to the API clusters, by cluster id"""
+        table = self.table
+        return {
+            record.id: [
+                SnapshotArticle(
+                    external_id=table.external_ids[row],
+                    published=datetime.fromtimestamp(int(table.timestamp[row]))
+                )
+                for row in record.rows
+            ]
+            for record in self.records(category)
+        }
+
+    def load_news_clusters(
+        self,
+        category: str,
+        clusters: List[NewsCluster],
+        articles: Optional[Dict[str, List[SnapshotArticle]]] = None
+    ):
+        """Replace a category with API-model clusters (e.g. from a shared snapshot).
+
+        Records this store already holds under the same id are kept when
+        unchanged; otherwise the embeddings of their articles carry over.
+        """
+        metadata_by_cluster = articles or {}
+        table = self.table
+        existing = {record.id: record for record in self.records(category)}
+        records = []
+        for cluster in clusters:
+            metadata = metadata_by_cluster.get(cluster.id, [])
+            for summary in cluster.articles:
+                previous = existing.get(cluster.id)
+                urls = [source.url for source in summary.sources]
+                if previous and previous.title == summary.title and previous.summary == summary.summary \
+                        and [table.urls[row] for row in previous.rows] == urls:
+                    records.append(previous)
+                    continue
+
+                created_at = datetime.fromisoformat(summary.timestamp)
+                raw_articles = [
+                    RawArticle(
+                        title=summary.title,
+                        content='',
+                        url=source.url,
+                        source=source.name,
+                        source_type=source.type,
+                        timestamp=metadata[index].published if index < len(metadata) else created_at,
+                        category=category,
+                        external_id=metadata[index].external_id if index < len(metadata) else None
+                    )
+                    for index, source in enumerate(summary.sources)
+                ]
+                records.append(self.add_cluster(
+                    category,
+                    cluster.id,
+                    {
+                        'title': summary.title,
+                        'summary': summary.summary,
+                        'differing_narratives': summary.differing_narratives
+                    },
+                    raw_articles,
+                    summary.bias_analysis,
+                    created_at=datetime.fromisoformat(cluster.last_updated)
+                ))
+                if previous and table.embeddings is not None:
+                    # Clusters extended by another worker keep their earlier articles first
+                    for old_row, new_row in zip(previous.rows, records[-1].rows):
+                        if table.has_embedding[old_row] and table.urls[old_row] == table.urls[new_row]:
+                            table.set_embedding(new_row, table.embeddings[old_row])
+        self.set_clusters(category, records)
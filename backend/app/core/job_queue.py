@@ -0,0 +1,200 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.models.news_models import RefreshJobStatus
+
+logger = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITY_USER = 0
+PRIORITY_SCHEDULED = 1
+PRIORITY_NAMES = {PRIORITY_USER: 'user', PRIORITY_SCHEDULED: 'scheduled'}
+
+
+class QueueFullError(Exception):
+    """Raised when the refresh queue cannot accept another job"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Refresh queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class RefreshJob:
+    def __init__(self, category: str, priority: int):
+        self.id = uuid.uuid4().hex
+        self.category = category
+        self.priority = priority
+        self.status = 'queued'  # queued, running, succeeded, failed
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.clusters: Optional[int] = None
+        self.error: Optional[str] = None
+        self.done = asyncio.Event()
+
+    def to_status(self) -> RefreshJobStatus:
+        return RefreshJobStatus(
+            id=self.id,
+            category=self.category,
+            priority=PRIORITY_NAMES[self.priority],
+            status=self.status,
+            created_at=self.created_at.isoformat(),
+            started_at=self.started_at.isoformat() if self.started_at else None,
+            finished_at=self.finished_at.isoformat() if self.finished_at else None,
+            clusters=self.clusters,
+            error=self.error
+        )
+
+
+class RefreshJobQueue:
+    """Bounded priority queue of category refreshes run by a fixed pool of workers.
+
+    Requests for a category that is already queued or running share that job
+    (a user request upgrades a queued scheduled job), and a category refreshed
+    within the debounce interval is not refreshed again.
+    """
+
+    def __init__(
+        self,
+        news_service,
+        max_workers: int = 2,
+        max_queued: int = 20,
+        debounce_seconds: float = 60.0,
+        max_finished_jobs: int = 500
+    ):
+        self.news_service = news_service
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.debounce_seconds = debounce_seconds
+        self.max_finished_jobs = max_finished_jobs
+
+        self.heap: List[Tuple[int, int, RefreshJob]] = []
+        self.sequence = itertools.count()
+        self.condition = asyncio.Condition()
+        self.workers: List[asyncio.Task] = []
+
+        # Pending (queued or running) job per category, and recent jobs by id
+        self.pending: Dict[str, RefreshJob] = {}
+        self.jobs: "OrderedDict[str, RefreshJob]" = OrderedDict()
+        self.last_success: Dict[str, Tuple[float, RefreshJob]] = {}
+
+        # Moving average of job duration, used for Retry-After
+        self.average_duration = 30.0
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for job in self.pending.values() if job.status == 'queued')
+
+    async def start(self):
+        if self.workers:
+            return
+        self.workers = [asyncio.create_task(self._worker_loop()) for _ in range(self.max_workers)]
+        logger.info(f"Refresh job queue started with {self.max_workers} workers")
+
+    async def stop(self):
+        for task in self.workers:
+            task.cancel()
+        for task in self.workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.workers = []
+
+        # Jobs still queued will never run; fail them so waiting requests return
+        for job in self.pending.values():
+            if not job.done.is_set():
+                job.status = 'failed'
+                job.error = "Refresh queue stopped"
+                job.finished_at = datetime.now()
+                job.done.set()
+        self.pending.clear()
+        self.heap.clear()
+        logger.info("Refresh job queue stopped")
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.average_duration * (self.queued + 1) / self.max_workers))
+
+    async def submit(self, category: str, priority: int = PRIORITY_USER) -> RefreshJob:
+        """Queue a refresh, or return the job that already covers it"""
+        job = self.pending.get(category)
+        if job:
+            if job.status == 'queued' and priority < job.priority:
+                # Re-push at the higher priority; the old heap entry is skipped
+                job.priority = priority
+                async with self.condition:
+                    heapq.heappush(self.heap, (priority, next(self.sequence), job))
+                    self.condition.notify()
+            return job
+
+        recent = self.last_success.get(category)
+        if recent and time.monotonic() - recent[0] < self.debounce_seconds:
+            return recent[1]
+
+        if self.queued >= self.max_queued:
+            raise QueueFullError(self.retry_after())
+
+        job = RefreshJob(category, priority)
+        self.pending[category] = job
+        self.remember(job)
+        async with self.condition:
+            heapq.heappush(self.heap, (priority, next(self.sequence), job))
+            self.condition.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[RefreshJob]:
+        return self.jobs.get(job_id)
+
+    def remember(self, job: RefreshJob):
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.max_finished_jobs:
+            oldest_id, oldest = next(iter(self.jobs.items()))
+            if not oldest.done.is_set():
+                break
+            del self.jobs[oldest_id]
+
+    async def _next_job(self) -> RefreshJob:
+        async with self.condition:
+            while True:
+                await self.condition.wait_for(lambda: self.heap)
+                priority, _, job = heapq.heappop(self.heap)
+                # Skip entries superseded by a priority upgrade
+                if job.status == 'queued' and priority == job.priority:
+                    job.status = 'running'
+                    return job
+
+    async def _worker_loop(self):
+        while True:
+            try:
+                job = await self._next_job()
+            except asyncio.CancelledError:
+                break
+
+            job.started_at = datetime.now()
+            started = time.monotonic()
+            try:
+                clusters = await self.news_service.fetch_and_process_news(job.category)
+                job.clusters = len(clusters)
+                job.status = 'succeeded'
+                self.last_success[job.category] = (time.monotonic(), job)
+            except asyncio.CancelledError:
+                job.status = 'failed'
+                job.error = "Cancelled"
+                raise
+            except Exception as e:
+                logger.error(f"Refresh job {job.id} for {job.category} failed: {e}")
+                job.status = 'failed'
+                job.error = str(e)
+            finally:
+                duration = time.monotonic() - started
+                self.average_duration = 0.8 * self.average_duration + 0.2 * duration
+                job.finished_at = datetime.now()
+                self.pending.pop(job.category, None)
+                job.done.set()
@@ -0,0 +1,100 @@
+import asyncio
+import fcntl
+import logging
+import os
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """Advisory cross-process lock on a file (released automatically if the holder dies)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = None
+
+    def try_acquire(self) -> bool:
+        if self.fd is not None:
+            return True
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self.fd = fd
+        return True
+
+    async def acquire(self, poll_interval: float = 0.2):
+        while not self.try_acquire():
+            await asyncio.sleep(poll_interval)
+
+    def release(self):
+        if self.fd is None:
+            return
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+        self.fd = None
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class LeaderElection:
+    """Elects a single leader among worker processes through a file lock.
+
+    Followers keep retrying so that another worker takes over when the
+    leader process exits.
+    """
+
+    def __init__(
+        self,
+        lock_path: str,
+        on_elected: Callable[[], Awaitable[None]],
+        retry_interval: float = 5.0
+    ):
+        self.lock = FileLock(lock_path)
+        self.on_elected = on_elected
+        self.retry_interval = retry_interval
+        self.is_leader = False
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.task:
+            return
+        self.task = asyncio.create_task(self._election_loop())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.lock.release()
+        self.is_leader = False
+
+    async def _election_loop(self):
+        while not self.is_leader:
+            try:
+                if self.lock.try_acquire():
+                    self.is_leader = True
+                    logger.info(f"Worker {os.getpid()} elected leader")
+                    await self.on_elected()
+                    break
+                await asyncio.sleep(self.retry_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in leader election: {e}")
+                await asyncio.sleep(self.retry_interval)
@@ -1,14 +1,16 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional
 from app.services.news_service import NewsService
+from app.core.job_queue import PRIORITY_SCHEDULED, QueueFullError, RefreshJobQueue
 
 logger = logging.getLogger(__name__)
 
 class NewsScheduler:
-    def __init__(self, news_service: NewsService):
+    def __init__(self, news_service: NewsService, job_queue: Optional[RefreshJobQueue] = None):
         self.news_service = news_service
+        self.job_queue = job_queue
         self.running = False
         self.task = None
         
@@ -47,7 +49,13 @@ class NewsScheduler:
                     if await self.news_service.should_refresh_category(category):
                         logger.info(f"Refreshing news for category: {category}")
                         try:
-                            await self.news_service.fetch_and_process_news(category)
+                            if self.job_queue:
+                                # User-triggered refreshes take precedence
+                                await self.job_queue.submit(category, PRIORITY_SCHEDULED)
+                            else:
+                                await self.news_service.fetch_and_process_news(category)
+                        except QueueFullError:
+                            logger.warning(f"Refresh queue full, skipping scheduled refresh of {category}")
                         except Exception as e:
                             logger.error(f"Error refreshing {category}: {e}")
                 
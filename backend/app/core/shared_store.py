@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from app.models.news_models import NewsCluster, SnapshotArticle
+
+logger = logging.getLogger(__name__)
+
+SnapshotCallback = Callable[[str, List[NewsCluster], float, Dict[str, List[SnapshotArticle]]], None]
+
+
+class SharedSnapshotStore:
+    """SQLite-backed store that lets several worker processes share category snapshots"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                category TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            )
+            """
+        )
+
+        # Versions this process has already seen, per category
+        self.seen_versions: Dict[str, int] = {}
+        self.data_version = self._data_version()
+        self.watch_task = None
+
+    def _data_version(self) -> int:
+        # Changes when another connection commits to the database file
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def write_snapshot(
+        self,
+        category: str,
+        clusters: List[NewsCluster],
+        articles: Optional[Dict[str, List[SnapshotArticle]]] = None
+    ) -> int:
+        """Publish a category snapshot and return its new version
+
+        ``articles`` holds per-source fields the API models do not carry
+        (external ids, publish times), keyed by cluster id.
+        """
+        payload = json.dumps({
+            'clusters': [cluster.model_dump(mode='json') for cluster in clusters],
+            'articles': {
+                cluster_id: [item.model_dump(mode='json') for item in items]
+                for cluster_id, items in (articles or {}).items()
+            },
+        })
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT version FROM snapshots WHERE category = ?", (category,)
+            ).fetchone()
+            version = (row[0] if row else 0) + 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots (category, version, updated_at, payload) VALUES (?, ?, ?, ?)",
+                (category, version, time.time(), payload)
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        self.seen_versions[category] = version
+        return version
+
+    def read_snapshot(
+        self, category: str
+    ) -> Optional[Tuple[List[NewsCluster], float, Dict[str, List[SnapshotArticle]]]]:
+        """Return (clusters, updated_at, articles) for a category, or None if none was published"""
+        row = self.conn.execute(
+            "SELECT version, updated_at, payload FROM snapshots WHERE category = ?", (category,)
+        ).fetchone()
+        if not row:
+            return None
+
+        version, updated_at, payload = row
+        self.seen_versions[category] = version
+        data = json.loads(payload)
+        if isinstance(data, list):
+            # Snapshots written before per-source fields were added
+            data = {'clusters': data, 'articles': {}}
+        clusters = [NewsCluster.model_validate(item) for item in data['clusters']]
+        articles = {
+            cluster_id: [SnapshotArticle.model_validate(item) for item in items]
+            for cluster_id, items in data.get('articles', {}).items()
+        }
+        return clusters, updated_at, articles
+
+    def changed_categories(self) -> List[str]:
+        """Categories published by other processes since they were last read here"""
+        data_version = self._data_version()
+        if data_version == self.data_version:
+            return []
+        self.data_version = data_version
+
+        rows = self.conn.execute("SELECT category, version FROM snapshots").fetchall()
+        return [
+            category for category, version in rows
+            if self.seen_versions.get(category) != version
+        ]
+
+    async def watch(self, on_change: SnapshotCallback, interval: float = 1.0):
+        """Poll for snapshots published by other workers and hand them to ``on_change``"""
+        while True:
+            try:
+                for category in self.changed_categories():
+                    snapshot = self.read_snapshot(category)
+                    if snapshot:
+                        on_change(category, *snapshot)
+                        logger.info(f"Loaded shared snapshot for {category}")
+                await asyncio.sleep(interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error watching shared snapshots: {e}")
+                await asyncio.sleep(interval)
+
+    def start_watching(self, on_change: SnapshotCallback, interval: float = 1.0):
+        if not self.watch_task:
+            self.watch_task = asyncio.create_task(self.watch(on_change, interval))
+
+    async def close(self):
+        if self.watch_task:
+            self.watch_task.cancel()
+            try:
+                await self.watch_task
+            except asyncio.CancelledError:
+                pass
+            self.watch_task = None
+        self.conn.close()
@@ -1,10 +1,16 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import asyncio
+import os
+from datetime import datetime
+from typing import Literal, Optional
 from app.services.news_service import NewsService
-from app.models.news_models import NewsCategory, NewsCluster
+from app.models.news_models import BiasStatsReport, NewsCategory, NewsCluster, RefreshJobStatus, SearchResult
 from app.core.scheduler import NewsScheduler
+from app.core.job_queue import PRIORITY_USER, QueueFullError, RefreshJobQueue
+from app.core.shared_store import SharedSnapshotStore
+from app.core.leader import LeaderElection
 import logging
 
 # Configure logging
@@ -14,21 +20,55 @@ logger = logging.getLogger(__name__)
 # Global news service instance
 news_service = None
 scheduler = None
+snapshot_store = None
+leader_election = None
+job_queue = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global news_service, scheduler
-    news_service = NewsService()
-    scheduler = NewsScheduler(news_service)
+    global news_service, scheduler, snapshot_store, leader_election, job_queue
+    scheduler_enabled = os.getenv('NEWS_SCHEDULER_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+
+    # Multi-worker mode: workers share snapshots through SQLite and elect
+    # one leader to run the scheduler
+    shared_dir = os.getenv('NEWS_SHARED_DIR')
+    if shared_dir:
+        snapshot_store = SharedSnapshotStore(os.path.join(shared_dir, 'snapshots.sqlite3'))
+        news_service = NewsService(snapshot_store=snapshot_store, lock_dir=shared_dir)
+        snapshot_store.start_watching(news_service.apply_snapshot)
+    else:
+        news_service = NewsService()
+
+    # All refreshes go through a bounded queue with a fixed number of workers
+    job_queue = RefreshJobQueue(
+        news_service,
+        max_workers=int(os.getenv('REFRESH_WORKERS', '2')),
+        max_queued=int(os.getenv('REFRESH_QUEUE_SIZE', '20')),
+        debounce_seconds=float(os.getenv('REFRESH_DEBOUNCE_SECONDS', '60'))
+    )
+    await job_queue.start()
+    scheduler = NewsScheduler(news_service, job_queue)
     
-    # Disable this line to stop auto-scheduling
-    # asyncio.create_task(scheduler.start())
-    logger.info("News aggregation scheduler is DISABLED on startup")
+    if not scheduler_enabled:
+        logger.info("News aggregation scheduler is DISABLED on startup")
+    elif shared_dir:
+        leader_election = LeaderElection(os.path.join(shared_dir, 'scheduler.lock'), scheduler.start)
+        await leader_election.start()
+    else:
+        asyncio.create_task(scheduler.start())
 
     yield
 
     if scheduler:
         await scheduler.stop()
+    if leader_election:
+        await leader_election.stop()
+    if job_queue:
+        await job_queue.stop()
+    if news_service:
+        await news_service.close()
+    if snapshot_store:
+        await snapshot_store.close()
     logger.info("Application shutdown complete")
 
 
@@ -46,42 +86,120 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-Refresh-Job-Id"],
 )
 
 @app.get("/")
 async def root():
     return {"message": "AI News Reporter API is running"}
 
+def require_category(category: str):
+    """Reject categories the news service has no sources for"""
+    if category not in news_service.category_keywords:
+        raise HTTPException(status_code=404, detail=f"Unknown category: {category}")
+
+async def submit_refresh(category: str, response: Response):
+    """Queue a user refresh, answering 429 with Retry-After when the queue is full"""
+    try:
+        job = await job_queue.submit(category, PRIORITY_USER)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many refresh requests, please retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    response.headers["X-Refresh-Job-Id"] = job.id
+    return job
+
+async def wait_for_clusters(job, category: str) -> list[NewsCluster]:
+    """Wait for a refresh job and return the clusters it produced"""
+    await job.done.wait()
+    if job.status == 'failed':
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch news: {job.error}",
+            headers={"X-Refresh-Job-Id": job.id}
+        )
+    return news_service.cached_clusters(category) or []
+
 @app.get("/api/news/{category}", response_model=list[NewsCluster])
-async def get_news(category: str):
+async def get_news(category: str, response: Response):
     """Get news clusters for a specific category"""
+    if not news_service:
+        raise HTTPException(status_code=503, detail="News service not initialized")
+    require_category(category)
+
     try:
-        if not news_service:
-            raise HTTPException(status_code=503, detail="News service not initialized")
-        
-        clusters = await news_service.get_news_clusters(category)
-        return clusters
+        clusters = news_service.cached_clusters(category)
+        if clusters is not None:
+            return clusters
     except Exception as e:
         logger.error(f"Error fetching news for category {category}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch news: {str(e)}")
 
+    # If no cache exists, fetch news now (shared with concurrent requests)
+    job = await submit_refresh(category, response)
+    return await wait_for_clusters(job, category)
+
 @app.post("/api/news/{category}/refresh", response_model=list[NewsCluster])
-async def refresh_news(category: str, background_tasks: BackgroundTasks):
+async def refresh_news(category: str, response: Response):
     """Manually refresh news for a specific category"""
+    if not news_service:
+        raise HTTPException(status_code=503, detail="News service not initialized")
+    require_category(category)
+
+    # Queue the refresh; its progress is available at /api/jobs/{id}
+    job = await submit_refresh(category, response)
+
     try:
-        if not news_service:
-            raise HTTPException(status_code=503, detail="News service not initialized")
-        
-        # Trigger immediate refresh in background
-        background_tasks.add_task(news_service.fetch_and_process_news, category)
-        
-        # Return current cached data
-        clusters = await news_service.get_news_clusters(category)
+        # Return current cached data, or wait for the first fetch
+        clusters = news_service.cached_clusters(category)
+        if clusters is None:
+            clusters = await wait_for_clusters(job, category)
         return clusters
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error refreshing news for category {category}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to refresh news: {str(e)}")
 
+@app.get("/api/jobs/{job_id}", response_model=RefreshJobStatus)
+async def get_job(job_id: str):
+    """Status of a queued refresh job"""
+    job = job_queue.get(job_id) if job_queue else None
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_status()
+
+@app.get("/api/search", response_model=list[SearchResult])
+async def search_news(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Search archived clusters by keywords and semantic similarity"""
+    if not news_service:
+        raise HTTPException(status_code=503, detail="News service not initialized")
+
+    try:
+        return news_service.search_service.search(
+            q, category=category, source=source, since=since, until=until, limit=limit
+        )
+    except Exception as e:
+        logger.error(f"Error searching news for '{q}': {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to search news: {str(e)}")
+
+@app.get("/api/bias/sources", response_model=BiasStatsReport)
+async def get_source_bias(window: Literal['day', 'week'] = 'day', source: Optional[str] = None):
+    """Rolling sentiment statistics per source and per category"""
+    if not news_service:
+        raise HTTPException(status_code=503, detail="News service not initialized")
+
+    return news_service.bias_stats_service.report(window, source)
+
 @app.get("/api/categories", response_model=list[NewsCategory])
 async def get_categories():
     """Get all available news categories"""
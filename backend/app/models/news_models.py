@@ -37,6 +37,41 @@ class NewsCluster(BaseModel):
     articles: List[NewsSummary]
     last_updated: str
 
+class SearchResult(BaseModel):
+    cluster_id: str
+    title: str
+    summary: str
+    category: str
+    sources: List[NewsSource]
+    timestamp: str
+    score: float
+
+class BiasStats(BaseModel):
+    name: str
+    count: int
+    mean_compound: float
+    stddev_compound: float
+    positive: int
+    neutral: int
+    negative: int
+
+class BiasStatsReport(BaseModel):
+    window: str  # 'day' or 'week'
+    generated_at: str
+    sources: List[BiasStats]
+    categories: List[BiasStats]
+
+class RefreshJobStatus(BaseModel):
+    id: str
+    category: str
+    priority: str  # 'user' or 'scheduled'
+    status: str  # 'queued', 'running', 'succeeded', 'failed'
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    clusters: Optional[int] = None
+    error: Optional[str] = None
+
 class RawArticle(BaseModel):
     title: str
     content: str
@@ -44,4 +79,10 @@ class RawArticle(BaseModel):
     source: str
     source_type: str
     timestamp: datetime
-    category: str
\ No newline at end of file
+    category: str
+    external_id: Optional[str] = None  # e.g. Reddit fullname, used to skip items already processed
+class SnapshotArticle(BaseModel):
+    # Per-source fields shared between workers in snapshots but not served by the API,
+    # in the same order as the cluster's sources
+    external_id: Optional[str] = None
+    published: datetime
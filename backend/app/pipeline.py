@@ -0,0 +1,387 @@
+"""Headless batch pipeline: dedup, embed, cluster, sentiment and summarize.
+
+Used for backfills, re-clustering history after tuning ``eps`` and
+regenerating summaries after prompt changes. Categories are processed in
+parallel in a process pool; each category checkpoints its articles, cluster
+assignment and every summarized cluster, so an interrupted run resumes where
+it stopped. Finished categories are written to the shared snapshot store
+that API workers load when ``NEWS_SHARED_DIR`` points at the same directory.
+
+Usage (from ``backend/``):
+
+    python -m app.pipeline --input articles.jsonl --checkpoint-dir runs/backfill
+    python -m app.pipeline --live --categories science market --eps 0.4
+    python -m app.pipeline --input articles.jsonl --checkpoint-dir runs/backfill --resume
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+import numpy as np
+from dotenv import load_dotenv
+from app.core.shared_store import SharedSnapshotStore
+from app.models.news_models import NewsCluster, RawArticle, SnapshotArticle
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ['geopolitics', 'history', 'science', 'general', 'crime', 'market']
+
+# Per-process state of pool workers
+worker_loop = None
+worker_news_service = None
+
+
+def read_jsonl(path: str) -> List[Dict]:
+    records = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping malformed line {line_number} in {path}: {e}")
+    return records
+
+
+def write_jsonl(path: str, records: List[Dict]):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    os.replace(tmp_path, path)
+
+
+def load_input(path: str, categories: List[str]) -> Dict[str, List[Dict]]:
+    """Read RawArticle records from JSONL, grouped by category"""
+    grouped: Dict[str, List[Dict]] = {category: [] for category in categories}
+    skipped = 0
+    for record in read_jsonl(path):
+        try:
+            article = RawArticle.model_validate(record)
+        except Exception:
+            skipped += 1
+            continue
+        if article.category in grouped:
+            grouped[article.category].append(article.model_dump(mode='json'))
+    if skipped:
+        logger.warning(f"Skipped {skipped} records that are not valid articles")
+    missing = [category for category, articles in grouped.items() if not articles]
+    if missing:
+        logger.warning(f"No input articles for {', '.join(missing)}; their snapshots are left as they are")
+    return grouped
+
+
+def dedup_articles(articles: List[RawArticle], canonical_url) -> List[RawArticle]:
+    """Drop articles whose canonical URL or normalized title was already seen"""
+    seen_urls = set()
+    seen_titles = set()
+    unique = []
+    for article in articles:
+        url = canonical_url(article.url) if article.url else None
+        title = ' '.join(article.title.lower().split())
+        if (url and url in seen_urls) or (title and title in seen_titles):
+            continue
+        if url:
+            seen_urls.add(url)
+        if title:
+            seen_titles.add(title)
+        unique.append(article)
+    return unique
+
+
+class CategoryCheckpoint:
+    """Files recording one category's progress inside the run's checkpoint directory"""
+
+    def __init__(self, checkpoint_dir: str, category: str):
+        self.dir = os.path.join(checkpoint_dir, category)
+        os.makedirs(self.dir, exist_ok=True)
+        self.articles_path = os.path.join(self.dir, 'articles.jsonl')
+        self.embeddings_path = os.path.join(self.dir, 'embeddings.npy')
+        self.groups_path = os.path.join(self.dir, 'groups.json')
+        self.clusters_path = os.path.join(self.dir, 'clusters.jsonl')
+
+    def load_articles(self) -> Optional[List[RawArticle]]:
+        if not os.path.exists(self.articles_path):
+            return None
+        return [RawArticle.model_validate(record) for record in read_jsonl(self.articles_path)]
+
+    def save_articles(self, articles: List[RawArticle]):
+        write_jsonl(self.articles_path, [article.model_dump(mode='json') for article in articles])
+
+    def load_embeddings(self) -> Optional[np.ndarray]:
+        if not os.path.exists(self.embeddings_path):
+            return None
+        return np.load(self.embeddings_path)
+
+    def save_embeddings(self, embeddings: np.ndarray):
+        tmp_path = f"{self.embeddings_path}.tmp.npy"
+        np.save(tmp_path, embeddings)
+        os.replace(tmp_path, self.embeddings_path)
+
+    def load_groups(self) -> Optional[List[List[int]]]:
+        if not os.path.exists(self.groups_path):
+            return None
+        with open(self.groups_path) as f:
+            return json.load(f)
+
+    def save_groups(self, groups: List[List[int]]):
+        tmp_path = f"{self.groups_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(groups, f)
+        os.replace(tmp_path, self.groups_path)
+
+    def load_clusters(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.clusters_path):
+            return {}
+        return {record['id']: record for record in read_jsonl(self.clusters_path)}
+
+    def append_cluster(self, cluster: Dict):
+        with open(self.clusters_path, 'a') as f:
+            f.write(json.dumps(cluster) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def init_worker(eps: Optional[float]):
+    """Pool initializer: build one NewsService (and load the model) per process"""
+    global worker_loop, worker_news_service
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(processName)s %(levelname)s %(name)s: %(message)s")
+    if eps is not None:
+        os.environ['CLUSTERING_EPS'] = str(eps)
+
+    from app.services.news_service import NewsService
+
+    async def create():
+        return NewsService()
+
+    worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(worker_loop)
+    worker_news_service = worker_loop.run_until_complete(create())
+
+
+def run_category(category: str, articles: Optional[List[Dict]], checkpoint_dir: str, enrich: bool) -> Optional[Dict]:
+    """Pool task: run every stage for one category, resuming from its checkpoint"""
+    return worker_loop.run_until_complete(
+        process_category(worker_news_service, category, articles, checkpoint_dir, enrich)
+    )
+
+
+async def process_category(
+    news_service,
+    category: str,
+    input_articles: Optional[List[Dict]],
+    checkpoint_dir: str,
+    enrich: bool
+) -> Optional[Dict]:
+    """Run every stage for one category; returns None if there were no articles to process"""
+    start = time.perf_counter()
+    checkpoint = CategoryCheckpoint(checkpoint_dir, category)
+
+    # Stage 1: load (from checkpoint, input or live sources) and deduplicate
+    articles = checkpoint.load_articles()
+    if articles is None:
+        if input_articles is None:
+            fetched = await news_service.fetch_articles(category)
+        else:
+            fetched = [RawArticle.model_validate(record) for record in input_articles]
+        articles = dedup_articles(fetched, news_service.enrichment_service.canonical_url)
+        if not articles:
+            # Nothing to publish; an empty snapshot would wipe the category on the API workers
+            return None
+        if enrich:
+            articles = await news_service.enrichment_service.enrich_articles(articles)
+        checkpoint.save_articles(articles)
+        logger.info(f"{category}: {len(articles)} articles after dedup (from {len(fetched)})")
+
+    if not articles:
+        return None
+
+    # Stage 2: embed and cluster
+    embeddings = checkpoint.load_embeddings()
+    if embeddings is not None and len(embeddings) != len(articles):
+        logger.warning(f"{category}: checkpointed embeddings do not match the articles, embedding again")
+        embeddings = None
+    groups = checkpoint.load_groups()
+    if groups is None:
+        if embeddings is None:
+            embeddings = await news_service.clustering_service.embed_articles(articles)
+            if embeddings is not None:
+                checkpoint.save_embeddings(embeddings)
+        article_rows = {id(article): row for row, article in enumerate(articles)}
+        clusters = await news_service.clustering_service.cluster_articles(articles, embeddings)
+        groups = [[article_rows[id(article)] for article in cluster] for cluster in clusters]
+        checkpoint.save_groups(groups)
+        logger.info(f"{category}: {len(groups)} clusters")
+
+    # Stage 3: sentiment and summaries, checkpointed per cluster
+    done = checkpoint.load_clusters()
+    pending = 0
+    for group in groups:
+        cluster_articles = [articles[row] for row in group]
+        cluster_id = news_service.generate_cluster_id(cluster_articles)
+        if cluster_id in done:
+            continue
+
+        cluster_embeddings = embeddings[group] if embeddings is not None else None
+        record = await news_service.process_cluster(cluster_articles, category, cluster_embeddings)
+        if not record:
+            # Left for the next resumed run (e.g. the LLM call failed)
+            pending += 1
+            continue
+
+        cluster = news_service.article_store.to_news_cluster(record).model_dump(mode='json')
+        news_service.article_store.discard([record])
+        checkpoint.append_cluster(cluster)
+        done[cluster_id] = cluster
+
+    # Keep the order of the cluster assignment in the snapshot
+    ordered = []
+    snapshot_articles = {}
+    for group in groups:
+        cluster_articles = [articles[row] for row in group]
+        cluster_id = news_service.generate_cluster_id(cluster_articles)
+        if cluster_id in done:
+            ordered.append(done.pop(cluster_id))
+            snapshot_articles[cluster_id] = [
+                SnapshotArticle(external_id=article.external_id, published=article.timestamp).model_dump(mode='json')
+                for article in cluster_articles
+            ]
+
+    return {
+        'category': category,
+        'articles': len(articles),
+        'clusters': ordered,
+        'snapshot_articles': snapshot_articles,
+        'pending': pending,
+        'seconds': round(time.perf_counter() - start, 2),
+    }
+
+
+def load_state(checkpoint_dir: str) -> Dict:
+    path = os.path.join(checkpoint_dir, 'state.json')
+    if not os.path.exists(path):
+        return {'completed': []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(checkpoint_dir: str, state: Dict):
+    path = os.path.join(checkpoint_dir, 'state.json')
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the news pipeline in batch, outside the API")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input', help="JSONL file of RawArticle records")
+    source.add_argument('--live', action='store_true', help="Fetch articles from Reddit and Serper")
+    parser.add_argument('--categories', nargs='+', default=CATEGORIES)
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help="Directory for resumable progress (default: .pipeline_runs/<timestamp>)")
+    parser.add_argument('--resume', action='store_true', help="Skip categories completed in the checkpoint dir")
+    parser.add_argument('--store', default=None,
+                        help="Snapshot store to publish to (default: $NEWS_SHARED_DIR/snapshots.sqlite3)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--eps', type=float, default=None, help="DBSCAN eps override")
+    parser.add_argument('--enrich', action='store_true', help="Fetch full article text before clustering")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(processName)s %(levelname)s %(name)s: %(message)s")
+    args = parse_args(argv)
+
+    checkpoint_dir = args.checkpoint_dir or os.path.join('.pipeline_runs', time.strftime('%Y%m%d-%H%M%S'))
+    if args.resume and not os.path.isdir(checkpoint_dir):
+        logger.error(f"Nothing to resume in {checkpoint_dir}")
+        return 1
+    if not args.resume and os.path.isdir(checkpoint_dir) and os.listdir(checkpoint_dir):
+        logger.error(f"{checkpoint_dir} already holds a run; pass --resume or choose another directory")
+        return 1
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    store_path = args.store
+    if not store_path:
+        shared_dir = os.getenv('NEWS_SHARED_DIR', os.path.join(os.getcwd(), '.news_shared'))
+        store_path = os.path.join(shared_dir, 'snapshots.sqlite3')
+
+    snapshot_store = SharedSnapshotStore(store_path)
+
+    state = load_state(checkpoint_dir) if args.resume else {'completed': []}
+    categories = [category for category in args.categories if category not in state['completed']]
+    if not categories:
+        logger.info("All categories already completed")
+        return 0
+
+    if args.input:
+        inputs = load_input(args.input, categories)
+        categories = [category for category in categories if inputs[category]]
+        if not categories:
+            logger.error("The input has no articles for the requested categories")
+            return 1
+    else:
+        inputs = {category: None for category in categories}
+    workers = max(1, min(args.workers, len(categories)))
+    logger.info(f"Processing {len(categories)} categories with {workers} workers, checkpoints in {checkpoint_dir}")
+
+    failed = []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker, initargs=(args.eps,)) as pool:
+        futures = {
+            pool.submit(run_category, category, inputs[category], checkpoint_dir, args.enrich): category
+            for category in categories
+        }
+        for future in as_completed(futures):
+            category = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"{category}: failed: {e}")
+                failed.append(category)
+                continue
+
+            if result is None:
+                logger.warning(f"{category}: no articles fetched, snapshot not published")
+                failed.append(category)
+                continue
+
+            clusters = [NewsCluster.model_validate(cluster) for cluster in result['clusters']]
+            if clusters:
+                snapshot_articles = {
+                    cluster_id: [SnapshotArticle.model_validate(item) for item in items]
+                    for cluster_id, items in result['snapshot_articles'].items()
+                }
+                snapshot_store.write_snapshot(category, clusters, snapshot_articles)
+            logger.info(
+                f"{category}: {result['articles']} articles -> {len(clusters)} clusters "
+                f"in {result['seconds']}s, " + ("snapshot published" if clusters else "snapshot not published")
+            )
+
+            if result['pending']:
+                logger.warning(f"{category}: {result['pending']} clusters not summarized; rerun with --resume")
+                failed.append(category)
+            else:
+                state['completed'].append(category)
+                save_state(checkpoint_dir, state)
+
+    asyncio.run(snapshot_store.close())
+    if failed:
+        logger.warning(f"Incomplete categories: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
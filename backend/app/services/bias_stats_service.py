@@ -0,0 +1,164 @@
+import logging
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.models.news_models import BiasAnalysis, BiasStats, BiasStatsReport
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SECONDS = 3600
+
+# Rolling windows, in hourly buckets
+WINDOWS = {
+    'day': 24,
+    'week': 24 * 7,
+}
+
+
+class RunningStats:
+    """Streaming mean/variance (Welford) of compound scores plus sentiment counts.
+
+    Aggregates can be subtracted from one another, so window totals are kept
+    current by adding each score and subtracting buckets as they expire.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'positive', 'neutral', 'negative')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.positive = 0
+        self.neutral = 0
+        self.negative = 0
+
+    def add(self, value: float, sentiment: str):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if sentiment == 'positive':
+            self.positive += 1
+        elif sentiment == 'negative':
+            self.negative += 1
+        else:
+            self.neutral += 1
+
+    def subtract(self, other: 'RunningStats'):
+        """Remove a sub-aggregate (inverse of Chan et al.'s parallel merge)"""
+        if not other.count:
+            return
+        count = self.count - other.count
+        if count <= 0:
+            self.__init__()
+            return
+        mean = (self.count * self.mean - other.count * other.mean) / count
+        delta = other.mean - mean
+        self.m2 = max(0.0, self.m2 - other.m2 - delta * delta * count * other.count / self.count)
+        self.mean = mean
+        self.count = count
+        self.positive -= other.positive
+        self.neutral -= other.neutral
+        self.negative -= other.negative
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class RollingWindow:
+    """Per-key totals over the last ``size`` hourly buckets"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.totals: Dict[Tuple[str, str], RunningStats] = {}
+        self.oldest_bucket: Optional[int] = None  # oldest bucket included in the totals
+
+    def covers(self, bucket: int, current_bucket: int) -> bool:
+        return current_bucket - self.size < bucket <= current_bucket
+
+
+class BiasStatsService:
+    """Rolling per-source and per-category aggregates of sentiment scores"""
+
+    def __init__(self):
+        self.buckets: Dict[int, Dict[Tuple[str, str], RunningStats]] = {}
+        self.windows = {name: RollingWindow(size) for name, size in WINDOWS.items()}
+        self.current_bucket = self.bucket_of(time.time())
+        for window in self.windows.values():
+            window.oldest_bucket = self.current_bucket - window.size + 1
+
+    def bucket_of(self, timestamp: float) -> int:
+        return int(timestamp // BUCKET_SECONDS)
+
+    def record(self, category: str, analysis: BiasAnalysis, published: Optional[datetime] = None):
+        """Add one scored article to its hourly bucket and to every window covering it"""
+        self.advance()
+        now = time.time()
+        timestamp = min(published.timestamp(), now) if published else now
+        bucket = self.bucket_of(timestamp)
+
+        keys = (('source', analysis.source), ('category', category))
+        for window in self.windows.values():
+            if window.covers(bucket, self.current_bucket):
+                for key in keys:
+                    window.totals.setdefault(key, RunningStats()).add(analysis.compound, analysis.sentiment)
+
+        if self.current_bucket - bucket < max(WINDOWS.values()):
+            stats = self.buckets.setdefault(bucket, {})
+            for key in keys:
+                stats.setdefault(key, RunningStats()).add(analysis.compound, analysis.sentiment)
+
+    def advance(self):
+        """Subtract buckets that slid out of each window since the last call"""
+        current_bucket = self.bucket_of(time.time())
+        if current_bucket == self.current_bucket:
+            return
+        self.current_bucket = current_bucket
+
+        for window in self.windows.values():
+            new_oldest = current_bucket - window.size + 1
+            expired = [bucket for bucket in self.buckets if window.oldest_bucket <= bucket < new_oldest]
+            for bucket in expired:
+                for key, stats in self.buckets[bucket].items():
+                    total = window.totals.get(key)
+                    if total:
+                        total.subtract(stats)
+                        if not total.count:
+                            del window.totals[key]
+            window.oldest_bucket = new_oldest
+
+        horizon = current_bucket - max(WINDOWS.values())
+        for bucket in [bucket for bucket in self.buckets if bucket <= horizon]:
+            del self.buckets[bucket]
+
+    def to_model(self, name: str, stats: RunningStats) -> BiasStats:
+        return BiasStats(
+            name=name,
+            count=stats.count,
+            mean_compound=round(stats.mean, 4),
+            stddev_compound=round(stats.stddev, 4),
+            positive=stats.positive,
+            neutral=stats.neutral,
+            negative=stats.negative
+        )
+
+    def report(self, window: str = 'day', source: Optional[str] = None) -> BiasStatsReport:
+        """Current aggregates for a window; a single source is a dictionary lookup"""
+        self.advance()
+        totals = self.windows[window].totals
+
+        if source:
+            stats = totals.get(('source', source))
+            sources = [self.to_model(source, stats)] if stats else []
+        else:
+            sources = [self.to_model(name, stats) for (kind, name), stats in totals.items() if kind == 'source']
+
+        categories = [self.to_model(name, stats) for (kind, name), stats in totals.items() if kind == 'category']
+        return BiasStatsReport(
+            window=window,
+            generated_at=datetime.now().isoformat(),
+            sources=sorted(sources, key=lambda item: -item.count),
+            categories=sorted(categories, key=lambda item: item.name)
+        )
@@ -1,5 +1,6 @@
 import logging
-from typing import List
+import os
+from typing import List, Optional
 from sentence_transformers import SentenceTransformer
 from sklearn.cluster import DBSCAN
 import numpy as np
@@ -16,21 +17,49 @@ class ClusteringService:
             logger.error(f"Failed to load sentence transformer: {e}")
             self.model = None
 
-    async def cluster_articles(self, articles: List[RawArticle]) -> List[List[RawArticle]]:
-        """Cluster similar articles together"""
+        # DBSCAN neighbourhood radius (cosine distance)
+        self.eps = float(os.getenv('CLUSTERING_EPS', '0.5'))
+
+    async def embed_articles(self, articles: List[RawArticle]) -> Optional[np.ndarray]:
+        """Embed articles (title and content); returns None if the model is unavailable"""
+        if not self.model or not articles:
+            return None
+
+        try:
+            texts = [f"{article.title} {article.content}" for article in articles]
+            return self.model.encode(texts)
+        except Exception as e:
+            logger.error(f"Error embedding articles: {e}")
+            return None
+
+    def assign_to_clusters(self, embeddings: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Index of the nearest centroid for each embedding, or -1 if none is within ``eps`` (cosine distance)"""
+        vectors = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        centers = centroids / np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        similarity = vectors @ centers.T
+        nearest = similarity.argmax(axis=1)
+        distance = 1.0 - similarity[np.arange(len(vectors)), nearest]
+        return np.where(distance <= self.eps, nearest, -1)
+
+    async def cluster_articles(
+        self,
+        articles: List[RawArticle],
+        embeddings: Optional[np.ndarray] = None
+    ) -> List[List[RawArticle]]:
+        """Cluster similar articles together (reusing ``embeddings`` if already computed)"""
         if not self.model or len(articles) < 2:
             # Return each article as its own cluster
             return [[article] for article in articles]
 
         try:
-            # Extract text for embedding
-            texts = [f"{article.title} {article.content}" for article in articles]
-            
             # Generate embeddings
-            embeddings = self.model.encode(texts)
+            if embeddings is None:
+                embeddings = await self.embed_articles(articles)
+            if embeddings is None:
+                return [[article] for article in articles]
             
             # Perform clustering
-            clustering = DBSCAN(eps=0.5, min_samples=2, metric='cosine')
+            clustering = DBSCAN(eps=self.eps, min_samples=2, metric='cosine')
             cluster_labels = clustering.fit_predict(embeddings)
             
             # Group articles by cluster
@@ -0,0 +1,216 @@
+import aiohttp
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from lxml import etree, html as lxml_html
+from app.models.news_models import RawArticle
+
+logger = logging.getLogger(__name__)
+
+# Hosts whose pages are not articles (or already covered by the source itself)
+SKIPPED_HOSTS = ('reddit.com', 'redd.it', 'imgur.com', 'youtube.com', 'youtu.be', 'twitter.com', 'x.com')
+SKIPPED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.gifv', '.webp', '.mp4', '.pdf')
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'ocid', 'cmpid')
+
+# Elements that never hold the article body
+BOILERPLATE_TAGS = ('script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'svg', 'figure')
+
+
+class CachedPage:
+    __slots__ = ('text', 'etag', 'last_modified', 'fetched_at')
+
+    def __init__(self, text: str, etag: Optional[str], last_modified: Optional[str], fetched_at: float):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+
+class EnrichmentService:
+    """Fetches article pages to replace short snippets with the main article text"""
+
+    def __init__(self):
+        self.enabled = os.getenv('ENRICHMENT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.time_budget = float(os.getenv('ENRICHMENT_BUDGET_SECONDS', '10'))
+        self.request_timeout = float(os.getenv('ENRICHMENT_REQUEST_TIMEOUT', '5'))
+        self.host_delay = float(os.getenv('ENRICHMENT_HOST_DELAY', '0.5'))
+        self.max_connections = 20
+        self.max_connections_per_host = 2
+        self.max_bytes = 2 * 1024 * 1024
+        self.max_chars = 5000
+        self.min_paragraph_chars = 40
+        self.revalidate_after = 1800  # seconds before a cached page is revalidated
+        self.user_agent = os.getenv('ENRICHMENT_USER_AGENT', 'NewsAggregator/1.0 (+article enrichment)')
+
+        # Canonical URL -> extracted page, least recently used first
+        self.cache: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self.max_cache_entries = 5000
+
+        self.host_locks: Dict[str, asyncio.Lock] = {}
+        self.host_last_request: Dict[str, float] = {}
+
+    async def enrich_articles(self, articles: List[RawArticle]) -> List[RawArticle]:
+        """Replace article snippets with full text, within the per-refresh time budget"""
+        if not self.enabled:
+            return articles
+
+        targets = [article for article in articles if self.should_enrich(article.url)]
+        if not targets:
+            return articles
+
+        start = time.monotonic()
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_connections_per_host)
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        headers = {'User-Agent': self.user_agent, 'Accept': 'text/html,application/xhtml+xml'}
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            tasks = {
+                asyncio.create_task(self.fetch_text(session, article.url)): article
+                for article in targets
+            }
+            done, pending = await asyncio.wait(tasks, timeout=self.time_budget)
+
+            # Slow hosts must never stall the pipeline; keep their snippets
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        enriched = 0
+        for task in done:
+            if task.cancelled() or task.exception():
+                continue
+            text = task.result()
+            article = tasks[task]
+            if text and len(text) > len(article.content):
+                article.content = text
+                enriched += 1
+
+        logger.info(
+            f"Enriched {enriched}/{len(targets)} articles in {time.monotonic() - start:.2f}s "
+            f"({len(pending)} timed out)"
+        )
+        return articles
+
+    def should_enrich(self, url: str) -> bool:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            return False
+        host = parts.hostname.lower()
+        if any(host == skipped or host.endswith(f".{skipped}") for skipped in SKIPPED_HOSTS):
+            return False
+        return not parts.path.lower().endswith(SKIPPED_EXTENSIONS)
+
+    def canonical_url(self, url: str) -> str:
+        """Normalize a URL so that tracking variants share one cache entry"""
+        parts = urlsplit(url.strip())
+        query = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith(TRACKING_PARAMS)
+        ]
+        path = parts.path.rstrip('/') or '/'
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+    async def fetch_text(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        """Fetch a page (conditionally, if cached) and return its main text"""
+        key = self.canonical_url(url)
+        cached = self.cache.get(key)
+        if cached:
+            self.cache.move_to_end(key)
+            if time.time() - cached.fetched_at < self.revalidate_after:
+                return cached.text
+
+        request_headers = {}
+        if cached and cached.etag:
+            request_headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            request_headers['If-Modified-Since'] = cached.last_modified
+
+        try:
+            await self.wait_for_host(urlsplit(url).hostname)
+            async with session.get(url, headers=request_headers, allow_redirects=True) as response:
+                if response.status == 304 and cached:
+                    cached.fetched_at = time.time()
+                    return cached.text
+
+                if response.status != 200:
+                    logger.debug(f"Enrichment fetch for {url} returned {response.status}")
+                    return cached.text if cached else None
+
+                if 'html' not in response.headers.get('Content-Type', 'text/html'):
+                    return None
+
+                body = await response.content.read(self.max_bytes)
+                text = self.extract_main_text(body)
+                self.store(key, CachedPage(
+                    text=text,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                    fetched_at=time.time()
+                ))
+                return text
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Enrichment fetch failed for {url}: {e}")
+            return cached.text if cached else None
+
+    async def wait_for_host(self, host: str):
+        """Politeness delay between consecutive requests to the same host"""
+        lock = self.host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            elapsed = time.monotonic() - self.host_last_request.get(host, 0.0)
+            if elapsed < self.host_delay:
+                await asyncio.sleep(self.host_delay - elapsed)
+            self.host_last_request[host] = time.monotonic()
+
+    def store(self, key: str, page: CachedPage):
+        self.cache[key] = page
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_cache_entries:
+            self.cache.popitem(last=False)
+
+    def extract_main_text(self, body: bytes) -> str:
+        """Extract the main article text by picking the densest block of paragraphs"""
+        if not body:
+            return ""
+
+        try:
+            document = lxml_html.fromstring(body)
+        except (etree.ParserError, ValueError):
+            return ""
+
+        etree.strip_elements(document, *BOILERPLATE_TAGS, with_tail=False)
+
+        # Prefer an explicit <article>, otherwise score each paragraph's parent
+        candidates = document.xpath('//article')
+        if candidates:
+            root = max(candidates, key=lambda element: len(element.text_content()))
+        else:
+            scores: Dict = {}
+            for paragraph in document.iter('p'):
+                length = len(paragraph.text_content().strip())
+                if length >= self.min_paragraph_chars:
+                    parent = paragraph.getparent()
+                    scores[parent] = scores.get(parent, 0) + length
+            if not scores:
+                return ""
+            root = max(scores, key=scores.get)
+
+        paragraphs = []
+        total = 0
+        for paragraph in root.iter('p'):
+            text = ' '.join(paragraph.text_content().split())
+            if len(text) < self.min_paragraph_chars:
+                continue
+            paragraphs.append(text)
+            total += len(text)
+            if total >= self.max_chars:
+                break
+
+        return '\n'.join(paragraphs)[:self.max_chars]
@@ -10,7 +10,7 @@ logger = logging.getLogger(__name__)
 class GeminiService:
     def __init__(self):
         self.api_key = os.getenv('GEMINI_API_KEY')
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
+        self.base_url = os.getenv('GEMINI_BASE_URL')
 
     async def generate_summary(self, articles: List[RawArticle], bias_analyses: List[BiasAnalysis]) -> Optional[Dict]:
         """Generate AI summary using Gemini SDK"""
@@ -23,7 +23,8 @@ class GeminiService:
             from google.genai import types
 
             # Initialize Gemini client
-            client = genai.Client(api_key=self.api_key)
+            http_options = types.HttpOptions(base_url=self.base_url) if self.base_url else None
+            client = genai.Client(api_key=self.api_key, http_options=http_options)
             prompt = self.create_summary_prompt(articles, bias_analyses)
 
             model = "gemma-3n-e4b-it"
@@ -1,29 +1,58 @@
 import asyncio
 import logging
-from typing import List, Dict
+import os
+import time
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import hashlib
 import json
-from app.models.news_models import NewsCluster, NewsSummary, RawArticle
+import numpy as np
+from app.core.article_store import ArticleStore, ClusterRecord, to_micros
+from app.core.ingestion import IngestionTracker
+from app.core.leader import FileLock
+from app.core.shared_store import SharedSnapshotStore
+from app.models.news_models import NewsCluster, RawArticle, SnapshotArticle
 from app.services.reddit_service import RedditService
 from app.services.serper_service import SerperService
 from app.services.gemini_service import GeminiService
 from app.services.clustering_service import ClusteringService
+from app.services.enrichment_service import EnrichmentService
 from app.services.sentiment_service import SentimentService
+from app.services.bias_stats_service import BiasStatsService
+from app.services.search_service import SearchService
 
 logger = logging.getLogger(__name__)
 
 class NewsService:
-    def __init__(self):
+    def __init__(self, snapshot_store: Optional[SharedSnapshotStore] = None, lock_dir: Optional[str] = None):
         self.reddit_service = RedditService()
         self.serper_service = SerperService()
         self.gemini_service = GeminiService()
         self.clustering_service = ClusteringService()
         self.sentiment_service = SentimentService()
+        self.enrichment_service = EnrichmentService()
+        self.bias_stats_service = BiasStatsService()
         
-        # In-memory cache for news clusters
-        self.news_cache: Dict[str, List[NewsCluster]] = {}
+        # In-memory cache for news clusters (compact records, converted to
+        # API models only when served)
+        self.article_store = ArticleStore()
         self.last_updated: Dict[str, datetime] = {}
+
+        # Shared snapshot store and lock directory for multi-worker deployments
+        self.snapshot_store = snapshot_store
+        self.lock_dir = lock_dir
+
+        # Items older than this are dropped before clustering, and clusters
+        # older than this are evicted from the cache
+        self.freshness_window = timedelta(hours=float(os.getenv('NEWS_FRESHNESS_HOURS', '24')))
+        self.ingestion_tracker = IngestionTracker(self.freshness_window)
+
+        # Search keeps clusters for longer than the cache does
+        archive_window = timedelta(days=float(os.getenv('NEWS_ARCHIVE_DAYS', '7')))
+        self.search_service = SearchService(
+            self.clustering_service, archive_window,
+            min_similarity=float(os.getenv('SEARCH_MIN_SIMILARITY', '0.3'))
+        )
         
         # Category to subreddit mapping
         self.category_subreddits = {
@@ -47,76 +76,272 @@ class NewsService:
 
     async def get_news_clusters(self, category: str) -> List[NewsCluster]:
         """Get cached news clusters for a category"""
-        if category not in self.news_cache:
+        clusters = self.cached_clusters(category)
+        if clusters is None:
             # If no cache exists, fetch news immediately
             await self.fetch_and_process_news(category)
+            clusters = self.article_store.news_clusters(category)
         
-        return self.news_cache.get(category, [])
+        return clusters
+
+    def cached_clusters(self, category: str) -> Optional[List[NewsCluster]]:
+        """Cached news clusters for a category, or None if it was never processed"""
+        if not self.article_store.has_category(category) and self.snapshot_store:
+            # Another worker may already have published this category
+            snapshot = self.snapshot_store.read_snapshot(category)
+            if snapshot:
+                self.apply_snapshot(category, *snapshot)
+
+        if not self.article_store.has_category(category):
+            return None
+        return self.article_store.news_clusters(category)
+
+    def apply_snapshot(
+        self,
+        category: str,
+        clusters: List[NewsCluster],
+        updated_at: float,
+        articles: Optional[Dict[str, List[SnapshotArticle]]] = None
+    ):
+        """Replace the cached clusters with a snapshot published by another worker"""
+        articles = articles or {}
+        # Count the scores this worker has not seen yet: whole new clusters, and
+        # the articles appended to clusters it already had. Scores are bucketed by
+        # publish time, as on the worker that produced them.
+        known_sizes = {record.id: len(record.rows) for record in self.article_store.records(category)}
+        for cluster in clusters:
+            known = known_sizes.get(cluster.id, 0)
+            metadata = articles.get(cluster.id, [])
+            for summary in cluster.articles:
+                for index in range(known, len(summary.bias_analysis)):
+                    published = metadata[index].published if index < len(metadata) \
+                        else datetime.fromisoformat(summary.timestamp)
+                    self.bias_stats_service.record(category, summary.bias_analysis[index], published)
+
+        # Items the other worker processed are not new to this one either
+        for cluster in clusters:
+            metadata = articles.get(cluster.id, [])
+            for summary in cluster.articles:
+                for index, source in enumerate(summary.sources):
+                    item = metadata[index] if index < len(metadata) else None
+                    self.ingestion_tracker.mark_seen(
+                        category,
+                        source.type,
+                        source.name,
+                        (item.external_id if item else None) or source.url,
+                        item.published if item else datetime.fromisoformat(summary.timestamp)
+                    )
+
+        self.article_store.load_news_clusters(category, clusters, articles)
+        self.last_updated[category] = datetime.fromtimestamp(updated_at)
+
+        # Snapshots carry no embeddings, so only re-index clusters that are new or changed
+        # and keep the vectors of the ones this worker indexed itself
+        self.search_service.index_clusters(self.article_store, [
+            record for record in self.article_store.records(category)
+            if not self.search_service.is_current(record)
+        ])
 
     async def fetch_and_process_news(self, category: str) -> List[NewsCluster]:
         """Fetch news from all sources and process into clusters"""
+        if not self.snapshot_store:
+            return await self.run_pipeline(category)
+
+        # Only one worker runs the pipeline for a category at a time; workers
+        # that waited reuse the snapshot it published instead of refetching
+        requested_at = time.time()
+        async with FileLock(os.path.join(self.lock_dir, f"refresh-{category}.lock")):
+            snapshot = self.snapshot_store.read_snapshot(category)
+            if snapshot and snapshot[1] >= requested_at:
+                self.apply_snapshot(category, *snapshot)
+                return snapshot[0]
+            return await self.run_pipeline(category)
+
+    async def fetch_articles(self, category: str) -> List[RawArticle]:
+        """Fetch the current articles for a category from all sources"""
+        logger.info(f"Fetching news for category: {category}")
+        
+        # Fetch from all sources concurrently
+        reddit_task = self.reddit_service.fetch_posts(
+            self.category_subreddits.get(category, []), 
+            category
+        )
+        serper_task = self.serper_service.search_news(
+            self.category_keywords.get(category, []), 
+            category
+        )
+        
+        reddit_articles, serper_articles = await asyncio.gather(
+            reddit_task, serper_task, return_exceptions=True
+        )
+        
+        # Handle exceptions; the refresh only fails if every source failed
+        if isinstance(reddit_articles, Exception) and isinstance(serper_articles, Exception):
+            raise RuntimeError(f"All sources failed (Reddit: {reddit_articles}; Serper: {serper_articles})")
+
+        if isinstance(reddit_articles, Exception):
+            logger.error(f"Reddit fetch failed: {reddit_articles}")
+            reddit_articles = []
+        
+        if isinstance(serper_articles, Exception):
+            logger.error(f"Serper fetch failed: {serper_articles}")
+            serper_articles = []
+        
+        # Combine all articles
+        return reddit_articles + serper_articles
+
+    async def run_pipeline(self, category: str) -> List[NewsCluster]:
+        """Run the fetch, cluster and summarize pipeline for a category
+
+        Raises if the sources could not be fetched or none of the new articles
+        could be stored, so callers (the refresh queue) can report the failure.
+        """
+        processed_clusters: List[ClusterRecord] = []
         try:
-            logger.info(f"Fetching news for category: {category}")
-            
-            # Fetch from all sources concurrently
-            reddit_task = self.reddit_service.fetch_posts(
-                self.category_subreddits.get(category, []), 
-                category
-            )
-            serper_task = self.serper_service.search_news(
-                self.category_keywords.get(category, []), 
-                category
-            )
-            
-            reddit_articles, serper_articles = await asyncio.gather(
-                reddit_task, serper_task, return_exceptions=True
-            )
-            
-            # Handle exceptions
-            if isinstance(reddit_articles, Exception):
-                logger.error(f"Reddit fetch failed: {reddit_articles}")
-                reddit_articles = []
-            
-            if isinstance(serper_articles, Exception):
-                logger.error(f"Serper fetch failed: {serper_articles}")
-                serper_articles = []
-            
-            # Combine all articles
-            all_articles = reddit_articles + serper_articles
+            all_articles = await self.fetch_articles(category)
             
             if not all_articles:
                 logger.warning(f"No articles found for category: {category}")
                 return []
             
             logger.info(f"Found {len(all_articles)} articles for {category}")
+
+            # Only process fresh items that earlier refreshes have not seen
+            new_articles = self.ingestion_tracker.select_delta(category, all_articles)
+            if not new_articles:
+                self.last_updated[category] = datetime.now()
+                return self.article_store.news_clusters(category)
+
+            # Replace short snippets with the full article text where possible
+            new_articles = await self.enrichment_service.enrich_articles(new_articles)
+            embeddings = await self.clustering_service.embed_articles(new_articles)
+            stored_articles: List[RawArticle] = []
+
+            # Articles about stories already in the cache join those clusters
+            matches, unmatched = self.match_retained_clusters(category, len(new_articles), embeddings)
+            for record, rows in matches:
+                try:
+                    articles = [new_articles[row] for row in rows]
+                    processed_clusters.append(self.extend_cluster(record, articles, category, embeddings[rows]))
+                    stored_articles.extend(articles)
+                except Exception as e:
+                    logger.error(f"Error extending cluster {record.id}: {e}")
+            updated = len(processed_clusters)
+
+            # Cluster the remaining articles
+            remaining = [new_articles[row] for row in unmatched]
+            remaining_embeddings = embeddings[unmatched] if embeddings is not None else None
+            clusters = await self.clustering_service.cluster_articles(remaining, remaining_embeddings)
+            article_rows = {id(article): row for row, article in enumerate(remaining)}
             
-            # Cluster similar articles
-            clusters = await self.clustering_service.cluster_articles(all_articles)
-            
-            # Process each cluster
-            processed_clusters = []
+            # Process each cluster; articles of clusters that could not be
+            # summarized stay unseen so the next refresh retries them
             for cluster in clusters:
                 try:
-                    processed_cluster = await self.process_cluster(cluster, category)
+                    cluster_embeddings = None
+                    if remaining_embeddings is not None:
+                        cluster_embeddings = remaining_embeddings[[article_rows[id(article)] for article in cluster]]
+                    processed_cluster = await self.process_cluster(cluster, category, cluster_embeddings)
                     if processed_cluster:
                         processed_clusters.append(processed_cluster)
+                        stored_articles.extend(cluster)
                 except Exception as e:
                     logger.error(f"Error processing cluster: {e}")
                     continue
+
+            if not stored_articles:
+                raise RuntimeError(f"None of the {len(new_articles)} new articles could be summarized")
             
-            # Cache the results
-            self.news_cache[category] = processed_clusters
+            # Merge the new clusters into the cache, evicting stale ones
+            cached_clusters = processed_clusters + self.retained_clusters(category, processed_clusters)
+            self.article_store.set_clusters(category, cached_clusters)
+            self.search_service.index_clusters(self.article_store, processed_clusters)
             self.last_updated[category] = datetime.now()
+            self.ingestion_tracker.commit(category, stored_articles)
+
+            news_clusters = self.article_store.news_clusters(category)
+            if self.snapshot_store:
+                self.snapshot_store.write_snapshot(
+                    category, news_clusters, self.article_store.snapshot_articles(category)
+                )
             
-            logger.info(f"Processed {len(processed_clusters)} clusters for {category}")
-            return processed_clusters
+            logger.info(
+                f"Processed {len(processed_clusters) - updated} new clusters for {category}, "
+                f"added articles to {updated} cached ones"
+            )
+            return news_clusters
             
         except Exception as e:
             logger.error(f"Error in fetch_and_process_news for {category}: {e}")
-            return []
+            raise
+        finally:
+            # Release rows of clusters that were stored but never published
+            self.article_store.discard(processed_clusters)
+
+    def match_retained_clusters(
+        self,
+        category: str,
+        count: int,
+        embeddings: Optional[np.ndarray]
+    ) -> Tuple[List[Tuple[ClusterRecord, List[int]]], List[int]]:
+        """Split new articles into those close to a cached cluster's centroid and the rest"""
+        rows = list(range(count))
+        if embeddings is None or not count:
+            return [], rows
+
+        candidates = []
+        centroids = []
+        for record in self.retained_clusters(category, []):
+            centroid = self.article_store.centroid(record)
+            if centroid is not None and centroid.shape[0] == embeddings.shape[1]:
+                candidates.append(record)
+                centroids.append(centroid)
+        if not candidates:
+            return [], rows
+
+        labels = self.clustering_service.assign_to_clusters(np.asarray(embeddings, dtype=np.float32), np.stack(centroids))
+        matched: Dict[int, List[int]] = {}
+        unmatched = []
+        for row, label in zip(rows, labels):
+            if label < 0:
+                unmatched.append(row)
+            else:
+                matched.setdefault(int(label), []).append(row)
+        return [(candidates[label], matched_rows) for label, matched_rows in matched.items()], unmatched
+
+    def extend_cluster(
+        self,
+        record: ClusterRecord,
+        articles: List[RawArticle],
+        category: str,
+        embeddings: np.ndarray
+    ) -> ClusterRecord:
+        """Add articles to a cached cluster under the same id; its summary is kept"""
+        bias_analyses = [
+            self.sentiment_service.analyze_sentiment(article.content, article.source)
+            for article in articles
+        ]
+        extended = self.article_store.extend_cluster(record, articles, bias_analyses, embeddings)
+        for article, analysis in zip(articles, bias_analyses):
+            self.bias_stats_service.record(category, analysis, article.timestamp)
+        return extended
+
+    def retained_clusters(self, category: str, new_clusters: List[ClusterRecord]) -> List[ClusterRecord]:
+        """Cached clusters that are still within the freshness window and not replaced"""
+        horizon = to_micros(datetime.now() - self.freshness_window)
+        new_ids = {cluster.id for cluster in new_clusters}
+        return [
+            cluster for cluster in self.article_store.records(category)
+            if cluster.id not in new_ids and cluster.created_at >= horizon
+        ]
 
-    async def process_cluster(self, articles: List[RawArticle], category: str) -> NewsCluster:
-        """Process a cluster of articles into a summarized news cluster"""
+    async def process_cluster(
+        self,
+        articles: List[RawArticle],
+        category: str,
+        embeddings: Optional[np.ndarray] = None
+    ) -> Optional[ClusterRecord]:
+        """Process a cluster of articles into a summarized cluster record"""
         try:
             if not articles:
                 return None
@@ -140,38 +365,15 @@ class NewsService:
             if not summary_data:
                 return None
             
-            # Create news sources
-            sources = [
-                {
-                    'name': article.source,
-                    'url': article.url,
-                    'type': article.source_type
-                }
-                for article in articles
-            ]
-            
-            # Create the news summary
-            news_summary = NewsSummary(
-                id=f"{cluster_id}_summary",
-                title=summary_data.get('title', articles[0].title),
-                summary=summary_data.get('summary', ''),
-                differing_narratives=summary_data.get('differing_narratives'),
-                bias_analysis=bias_analyses,
-                sources=sources,
-                category=category,
-                timestamp=datetime.now().isoformat(),
-                cluster_id=cluster_id
-            )
-            
-            # Create the cluster
-            cluster = NewsCluster(
-                id=cluster_id,
-                topic=summary_data.get('title', articles[0].title),
-                articles=[news_summary],
-                last_updated=datetime.now().isoformat()
+            # Store the cluster in the compact article table
+            record = self.article_store.add_cluster(
+                category, cluster_id, summary_data, articles, bias_analyses, embeddings
             )
-            
-            return cluster
+
+            # Count the scores only once the cluster is kept (dropped clusters are retried)
+            for article, analysis in zip(articles, bias_analyses):
+                self.bias_stats_service.record(category, analysis, article.timestamp)
+            return record
             
         except Exception as e:
             logger.error(f"Error processing cluster: {e}")
@@ -183,6 +385,10 @@ class NewsService:
         combined = ''.join(sorted(titles))
         return hashlib.md5(combined.encode()).hexdigest()[:12]
 
+    async def close(self):
+        """Release client sessions held by the source services"""
+        await self.reddit_service.close()
+
     async def should_refresh_category(self, category: str) -> bool:
         """Check if a category needs refreshing (older than 1 hour)"""
         if category not in self.last_updated:
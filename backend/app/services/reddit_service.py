@@ -19,6 +19,16 @@ class RedditService:
             client_id = os.getenv('REDDIT_CLIENT_ID')
             client_secret = os.getenv('REDDIT_CLIENT_SECRET')
             user_agent = os.getenv('REDDIT_USER_AGENT', 'NewsAggregator/1.0')
+
+            # Optional endpoint overrides (used by the offline benchmark fakes)
+            endpoints = {}
+            if os.getenv('REDDIT_OAUTH_URL'):
+                endpoints['oauth_url'] = os.getenv('REDDIT_OAUTH_URL')
+            if os.getenv('REDDIT_URL'):
+                endpoints['reddit_url'] = os.getenv('REDDIT_URL')
+            if endpoints:
+                # Overridden endpoints are local fakes; don't ask PyPI for asyncpraw updates either
+                endpoints['check_for_updates'] = False
             
             if not client_id or not client_secret:
                 logger.warning("Reddit credentials not found, using read-only mode")
@@ -26,13 +36,15 @@ class RedditService:
                 self.reddit = asyncpraw.Reddit(
                     client_id=None,
                     client_secret=None,
-                    user_agent=user_agent
+                    user_agent=user_agent,
+                    **endpoints
                 )
             else:
                 self.reddit = asyncpraw.Reddit(
                     client_id=client_id,
                     client_secret=client_secret,
-                    user_agent=user_agent
+                    user_agent=user_agent,
+                    **endpoints
                 )
         except Exception as e:
             logger.error(f"Failed to initialize Reddit client: {e}")
@@ -64,7 +76,8 @@ class RedditService:
                             source=f"r/{subreddit_name}",
                             source_type="reddit",
                             timestamp=datetime.fromtimestamp(submission.created_utc),
-                            category=category
+                            category=category,
+                            external_id=submission.fullname
                         )
                         articles.append(article)
                         
@@ -75,9 +88,10 @@ class RedditService:
         except Exception as e:
             logger.error(f"Error in Reddit fetch_posts: {e}")
         
-        finally:
-            if self.reddit:
-                await self.reddit.close()
-        
         logger.info(f"Fetched {len(articles)} articles from Reddit for {category}")
-        return articles
\ No newline at end of file
+        return articles
+
+    async def close(self):
+        """Close the Reddit client session (the client is reused across refreshes)"""
+        if self.reddit:
+            await self.reddit.close()
\ No newline at end of file
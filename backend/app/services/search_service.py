@@ -0,0 +1,305 @@
+import logging
+import math
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+import numpy as np
+from app.core.article_store import ArticleStore, ClusterRecord, StringInterner, from_micros, to_micros
+from app.models.news_models import NewsSource, SearchResult
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'their', 'this', 'to', 'was', 'were', 'will', 'with',
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class SearchDocument:
+    """An archived cluster as kept by the search index"""
+
+    __slots__ = ('cluster_id', 'title', 'summary', 'category', 'sources', 'created_at', 'terms')
+
+    def __init__(self, cluster_id: str, title: str, summary: str, category: int,
+                 sources: List[tuple], created_at: int, terms: Counter):
+        self.cluster_id = cluster_id
+        self.title = title
+        self.summary = summary
+        self.category = category
+        self.sources = sources  # (name code, url, type code)
+        self.created_at = created_at  # microseconds since the epoch
+        self.terms = terms
+
+
+class SearchService:
+    """Hybrid keyword (BM25) and vector search over archived clusters.
+
+    Documents are added as clusters are produced and removed once they fall
+    out of the archive window; slots of removed documents are reused, so the
+    postings and the dense arrays are never rebuilt.
+    """
+
+    def __init__(self, clustering_service, archive_window: timedelta, k1: float = 1.5, b: float = 0.75,
+                 min_similarity: float = 0.3):
+        self.clustering_service = clustering_service
+        self.archive_window = archive_window
+        self.k1 = k1
+        self.b = b
+        # Vector hits below this cosine similarity are unrelated and not fused
+        self.min_similarity = min_similarity
+        self.strings = StringInterner()
+
+        # Document slots and the cluster id -> slot lookup
+        self.documents: List[Optional[SearchDocument]] = []
+        self.slots: Dict[str, int] = {}
+        self.free_slots: List[int] = []
+
+        # Inverted index: term -> {slot: term frequency}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.source_slots: Dict[int, Set[int]] = {}
+        self.total_length = 0
+
+        # Dense per-slot columns for filtering, BM25 and vector scoring
+        self.capacity = 0
+        self.alive = np.zeros(0, dtype=bool)
+        self.doc_length = np.zeros(0, dtype=np.float32)
+        self.category = np.zeros(0, dtype=np.int16)
+        self.created_at = np.zeros(0, dtype=np.int64)
+        self.has_vector = np.zeros(0, dtype=bool)
+        self.vectors: Optional[np.ndarray] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.slots)
+
+    def grow(self):
+        capacity = max(256, self.capacity * 2)
+        for name in ('alive', 'doc_length', 'category', 'created_at', 'has_vector'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.capacity] = column
+            setattr(self, name, grown)
+        if self.vectors is not None:
+            grown = np.zeros((capacity, self.vectors.shape[1]), dtype=np.float32)
+            grown[:self.capacity] = self.vectors
+            self.vectors = grown
+        self.capacity = capacity
+
+    def index_clusters(self, store: ArticleStore, records: List[ClusterRecord]):
+        """Add (or replace) clusters in the index and drop expired ones"""
+        for record in records:
+            try:
+                self.index_cluster(store, record)
+            except Exception as e:
+                logger.error(f"Error indexing cluster {record.id}: {e}")
+        self.prune()
+
+    def is_current(self, record: ClusterRecord) -> bool:
+        """Whether the index already holds this version of the cluster"""
+        slot = self.slots.get(record.id)
+        if slot is None:
+            return False
+        document = self.documents[slot]
+        return document.title == record.title and len(document.sources) == len(record.rows)
+
+    def index_cluster(self, store: ArticleStore, record: ClusterRecord):
+        if record.id in self.slots:
+            self.remove(record.id)
+
+        table = store.table
+        value = store.strings.value
+        sources = [
+            (self.strings.intern(value(table.source[row])), table.urls[row],
+             self.strings.intern(value(table.source_type[row])))
+            for row in record.rows
+        ]
+        terms = Counter(tokenize(record.title) * 2 + tokenize(record.summary))
+        document = SearchDocument(
+            cluster_id=record.id,
+            title=record.title,
+            summary=record.summary,
+            category=self.strings.intern(value(record.category)),
+            sources=sources,
+            created_at=record.created_at,
+            terms=terms
+        )
+
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.documents[slot] = document
+        else:
+            slot = len(self.documents)
+            self.documents.append(document)
+            if slot >= self.capacity:
+                self.grow()
+        self.slots[record.id] = slot
+
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[slot] = frequency
+        for source_code, _, _ in sources:
+            self.source_slots.setdefault(source_code, set()).add(slot)
+
+        length = sum(terms.values())
+        self.total_length += length
+        self.alive[slot] = True
+        self.doc_length[slot] = length
+        self.category[slot] = document.category
+        self.created_at[slot] = record.created_at
+        self.has_vector[slot] = False
+
+        # Cluster embedding: normalized centroid of its article embeddings
+        centroid = store.centroid(record)
+        if centroid is not None:
+            norm = np.linalg.norm(centroid)
+            if norm > 0:
+                if self.vectors is None:
+                    self.vectors = np.zeros((self.capacity, centroid.shape[0]), dtype=np.float32)
+                if centroid.shape[0] == self.vectors.shape[1]:
+                    self.vectors[slot] = centroid / norm
+                    self.has_vector[slot] = True
+
+    def remove(self, cluster_id: str):
+        slot = self.slots.pop(cluster_id, None)
+        if slot is None:
+            return
+        document = self.documents[slot]
+
+        for term in document.terms:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+                if not postings:
+                    del self.postings[term]
+        for source_code, _, _ in document.sources:
+            self.source_slots.get(source_code, set()).discard(slot)
+
+        self.total_length -= sum(document.terms.values())
+        self.alive[slot] = False
+        self.has_vector[slot] = False
+        self.documents[slot] = None
+        self.free_slots.append(slot)
+
+    def prune(self):
+        """Remove documents older than the archive window"""
+        horizon = to_micros(datetime.now() - self.archive_window)
+        expired = np.nonzero(self.alive & (self.created_at < horizon))[0]
+        for slot in expired:
+            self.remove(self.documents[slot].cluster_id)
+
+    def filter_mask(
+        self,
+        category: Optional[str],
+        source: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime]
+    ) -> np.ndarray:
+        mask = self.alive.copy()
+        if category:
+            code = self.strings.codes.get(category)
+            if code is None:
+                return np.zeros_like(mask)
+            mask &= self.category == code
+        if source:
+            code = self.strings.codes.get(source)
+            slots = self.source_slots.get(code, set()) if code is not None else set()
+            source_mask = np.zeros_like(mask)
+            source_mask[list(slots)] = True
+            mask &= source_mask
+        if since:
+            mask &= self.created_at >= to_micros(since)
+        if until:
+            mask &= self.created_at <= to_micros(until)
+        return mask
+
+    def bm25_scores(self, terms: List[str]) -> np.ndarray:
+        scores = np.zeros(self.capacity, dtype=np.float32)
+        if not self.size:
+            return scores
+
+        average_length = self.total_length / self.size or 1.0
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            slots = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            frequencies = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+            idf = math.log(1 + (self.size - len(postings) + 0.5) / (len(postings) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.doc_length[slots] / average_length)
+            scores[slots] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+        return scores
+
+    def vector_scores(self, query: str) -> Optional[np.ndarray]:
+        if self.vectors is None or not self.has_vector.any() or not self.clustering_service.model:
+            return None
+        try:
+            embedding = np.asarray(self.clustering_service.model.encode([query])[0], dtype=np.float32)
+        except Exception as e:
+            logger.error(f"Error embedding search query: {e}")
+            return None
+        norm = np.linalg.norm(embedding)
+        if norm == 0 or embedding.shape[0] != self.vectors.shape[1]:
+            return None
+        scores = self.vectors @ (embedding / norm)
+        scores[~self.has_vector] = -np.inf
+        return scores
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 20,
+        rrf_k: int = 60
+    ) -> List[SearchResult]:
+        """Rank archived clusters by reciprocal rank fusion of BM25 and vector similarity"""
+        mask = self.filter_mask(category, source, since, until)
+        if not mask.any():
+            return []
+
+        candidates = max(limit * 5, 50)
+        fused = np.zeros(self.capacity, dtype=np.float64)
+
+        keyword = self.bm25_scores(tokenize(query))
+        keyword[~mask] = 0
+        matched = np.nonzero(keyword > 0)[0]
+        top = matched[np.argsort(-keyword[matched], kind='stable')][:candidates]
+        fused[top] += 1.0 / (rrf_k + np.arange(1, len(top) + 1))
+
+        semantic = self.vector_scores(query)
+        if semantic is not None:
+            semantic[~mask] = -np.inf
+            available = np.nonzero(semantic >= self.min_similarity)[0]
+            count = min(candidates, len(available))
+            if count:
+                top = available[np.argpartition(-semantic[available], count - 1)[:count]]
+                top = top[np.argsort(-semantic[top], kind='stable')]
+                fused[top] += 1.0 / (rrf_k + np.arange(1, len(top) + 1))
+
+        ranked = np.nonzero(fused > 0)[0]
+        ranked = ranked[np.argsort(-fused[ranked], kind='stable')][:limit]
+        return [self.to_result(slot, float(fused[slot])) for slot in ranked]
+
+    def to_result(self, slot: int, score: float) -> SearchResult:
+        document = self.documents[slot]
+        value = self.strings.value
+        return SearchResult(
+            cluster_id=document.cluster_id,
+            title=document.title,
+            summary=document.summary,
+            category=value(document.category),
+            sources=[
+                NewsSource(name=value(name), url=url, type=value(source_type))
+                for name, url, source_type in document.sources
+            ],
+            timestamp=from_micros(document.created_at).isoformat(),
+            score=round(score, 6)
+        )
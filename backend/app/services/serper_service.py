@@ -1,19 +1,56 @@
 import httpx
 import logging
+import re
 from typing import List
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 from app.models.news_models import RawArticle
 
 logger = logging.getLogger(__name__)
 
+RELATIVE_DATE_PATTERN = re.compile(
+    r'^(\d+|an?|one)\s+(second|sec|minute|min|hour|hr|day|week|month|year)s?\s+ago$'
+)
+
+RELATIVE_DATE_UNITS = {
+    'second': timedelta(seconds=1),
+    'sec': timedelta(seconds=1),
+    'minute': timedelta(minutes=1),
+    'min': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'hr': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+    'month': timedelta(days=30),
+    'year': timedelta(days=365),
+}
+
+ABSOLUTE_DATE_FORMATS = [
+    '%b %d, %Y',
+    '%B %d, %Y',
+    '%d %b %Y',
+    '%d %B %Y',
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S',
+    '%m/%d/%Y',
+]
+
 class SerperService:
     def __init__(self):
         self.api_key = os.getenv('SERPER_API_KEY')
-        self.base_url = "https://google.serper.dev/search"
+        self.base_url = os.getenv('SERPER_BASE_URL', "https://google.serper.dev/search")
 
-    async def search_news(self, keywords: List[str], category: str, num_results: int = 10) -> List[RawArticle]:
-        """Search for news articles using Serper API"""
+    async def search_news(
+        self,
+        keywords: List[str],
+        category: str,
+        num_results: int = 10
+    ) -> List[RawArticle]:
+        """Search for news articles using Serper API
+
+        Always searches the past day: items already processed are dropped by
+        the ingestion tracker, and items whose processing failed are retried.
+        """
         if not self.api_key:
             logger.warning("Serper API key not found")
             return []
@@ -72,12 +109,27 @@ class SerperService:
         return articles
 
     def parse_date(self, date_str: str) -> datetime:
-        """Parse date string from Serper API"""
-        try:
-            # Serper returns dates in various formats, handle common ones
-            if 'ago' in date_str.lower():
-                return datetime.now()
-            # Add more date parsing logic as needed
+        """Parse date string from Serper API
+
+        Serper returns relative dates ("3 hours ago", "1 day ago") for recent
+        items and absolute dates ("Jan 14, 2025") for older ones. Unparseable
+        dates fall back to the current time.
+        """
+        text = (date_str or '').strip().lower()
+        if not text:
             return datetime.now()
-        except:
-            return datetime.now()
\ No newline at end of file
+
+        match = RELATIVE_DATE_PATTERN.match(text)
+        if match:
+            amount, unit = match.groups()
+            count = int(amount) if amount.isdigit() else 1
+            return datetime.now() - count * RELATIVE_DATE_UNITS[unit]
+
+        for date_format in ABSOLUTE_DATE_FORMATS:
+            try:
+                return datetime.strptime(date_str.strip(), date_format)
+            except ValueError:
+                continue
+
+        logger.debug(f"Unrecognized Serper date format: {date_str}")
+        return datetime.now()
\ No newline at end of file
@@ -0,0 +1,256 @@
+import asyncio
+import html
+import json
+import logging
+import random
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class ProviderProfile:
+    """Latency and failure behaviour of a single fake provider"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+
+class FakeProviderServer:
+    """Local stand-in for the Serper, Reddit and Gemini HTTP APIs.
+
+    Replays the recorded fixtures in ``benchmarks/fixtures`` and runs on its own
+    event loop in a background thread, so that blocking clients (the Gemini SDK
+    streams synchronously) cannot deadlock it.
+
+    Article links in the fixtures are rewritten to point at the same server on
+    a distinct loopback address per original publisher host (127.0.0.10 and
+    up), so per-host crawler limits behave as they would against real sites.
+    """
+
+    def __init__(
+        self,
+        serper_per_query: int = 10,
+        profiles: Optional[Dict[str, ProviderProfile]] = None,
+        seed: int = 1234
+    ):
+        self.serper_per_query = serper_per_query
+        self.profiles = profiles or {}
+        self.random = random.Random(seed)
+        self.counters = {'serper': 0, 'reddit': 0, 'gemini': 0, 'pages': 0, 'not_modified': 0, 'errors': 0}
+        self.port = None
+
+        self.serper_fixture = self.load_fixture('serper_news.json')['news']
+        self.reddit_fixture = self.load_fixture('reddit_hot.json')
+        self.gemini_fixture = self.load_fixture('gemini_summary.json')
+        with open(FIXTURES_DIR / 'article_page.html') as f:
+            self.page_template = f.read()
+
+        # Original publisher host -> loopback address, and page path -> (title, snippet)
+        self.page_hosts: Dict[str, str] = {}
+        self.pages: Dict[str, tuple] = {}
+        for item in self.serper_fixture:
+            self.register_page(item['link'], item['title'], item['snippet'])
+        for child in self.reddit_fixture['data']['children']:
+            self.register_page(child['data']['url'], child['data']['title'], child['data']['title'])
+
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def load_fixture(self, name: str) -> Dict:
+        with open(FIXTURES_DIR / name) as f:
+            return json.load(f)
+
+    def register_page(self, url: str, title: str, snippet: str):
+        parts = urlsplit(url)
+        if parts.hostname not in self.page_hosts:
+            self.page_hosts[parts.hostname] = f"127.0.0.{10 + len(self.page_hosts)}"
+        self.pages[parts.path] = (title, snippet)
+
+    def local_url(self, url: str) -> str:
+        """Rewrite a fixture article link to the local page server"""
+        parts = urlsplit(url)
+        host = self.page_hosts.get(parts.hostname, '127.0.0.1')
+        return urlunsplit(('http', f"{host}:{self.port}", parts.path, parts.query, ''))
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables that point the services at this server"""
+        return {
+            'SERPER_API_KEY': 'offline-benchmark',
+            'SERPER_BASE_URL': f"{self.base_url}/search",
+            'GEMINI_API_KEY': 'offline-benchmark',
+            'GEMINI_BASE_URL': self.base_url,
+            'REDDIT_CLIENT_ID': 'offline-benchmark',
+            'REDDIT_CLIENT_SECRET': 'offline-benchmark',
+            'REDDIT_URL': self.base_url,
+            'REDDIT_OAUTH_URL': self.base_url,
+        }
+
+    def reset_counters(self):
+        with self._lock:
+            for key in self.counters:
+                self.counters[key] = 0
+
+    def start(self):
+        """Start the server in a background thread and wait until it listens"""
+        self._thread = threading.Thread(target=self._run, name="fake-providers", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        logger.info(f"Fake providers listening on {self.base_url}")
+
+    def stop(self):
+        if not self._loop:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop)
+        future.result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _serve(self):
+        app = web.Application()
+        app.router.add_post('/search', self.handle_serper)
+        app.router.add_post('/api/v1/access_token', self.handle_reddit_token)
+        app.router.add_get('/r/{subreddit}/hot', self.handle_reddit_hot)
+        app.router.add_post('/{version}/models/{model_action}', self.handle_gemini)
+        app.router.add_get('/{path:.*}', self.handle_page)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+        for address in self.page_hosts.values():
+            await web.TCPSite(self._runner, address, self.port).start()
+
+    async def simulate(self, provider: str) -> bool:
+        """Apply the provider's latency profile; returns False if this call should fail"""
+        profile = self.profiles.get(provider, ProviderProfile())
+        with self._lock:
+            self.counters[provider] += 1
+            delay = profile.latency_ms + self.random.uniform(0, profile.jitter_ms)
+            failed = self.random.random() < profile.error_rate
+            if failed:
+                self.counters['errors'] += 1
+
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+        return not failed
+
+    async def handle_serper(self, request: web.Request) -> web.Response:
+        if not await self.simulate('serper'):
+            return web.json_response({'message': 'Internal error'}, status=500)
+
+        payload = await request.json()
+        query = payload.get('q', '')
+        offset = sum(query.encode()) % len(self.serper_fixture)
+
+        news = []
+        for i in range(self.serper_per_query):
+            item = dict(self.serper_fixture[(offset + i) % len(self.serper_fixture)])
+            # Keep titles and links unique once the fixture wraps around
+            round_no = (offset + i) // len(self.serper_fixture)
+            if round_no:
+                item['title'] = f"{item['title']} ({round_no})"
+            item['link'] = self.local_url(f"{item['link']}?q={zlib.crc32(query.encode()) % 10000}&n={i}")
+            item['position'] = i + 1
+            news.append(item)
+
+        return web.json_response({'searchParameters': payload, 'news': news})
+
+    async def handle_reddit_token(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            'access_token': 'offline-benchmark-token',
+            'token_type': 'bearer',
+            'expires_in': 86400,
+            'scope': '*'
+        })
+
+    async def handle_reddit_hot(self, request: web.Request) -> web.Response:
+        if not await self.simulate('reddit'):
+            return web.json_response({'message': 'Internal Server Error', 'error': 500}, status=500)
+
+        subreddit = request.match_info['subreddit']
+        listing = json.loads(json.dumps(self.reddit_fixture))
+        # Shift the recorded creation times so the newest post is a few minutes old
+        newest = max(child['data']['created_utc'] for child in listing['data']['children'])
+        shift = time.time() - 300 - newest
+        for child in listing['data']['children']:
+            child['data']['created_utc'] += shift
+            child['data']['subreddit'] = subreddit
+            child['data']['id'] = f"{subreddit[:4]}{child['data']['id']}"
+            child['data']['name'] = f"t3_{child['data']['id']}"
+            child['data']['url'] = self.local_url(child['data']['url'])
+        return web.json_response(listing)
+
+    async def handle_gemini(self, request: web.Request) -> web.StreamResponse:
+        if not await self.simulate('gemini'):
+            return web.json_response(
+                {'error': {'code': 500, 'message': 'Internal error', 'status': 'INTERNAL'}},
+                status=500
+            )
+
+        text = json.dumps(self.gemini_fixture)
+        chunk = {
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': 'STOP',
+                'index': 0
+            }],
+            'modelVersion': request.match_info['model_action'].split(':')[0]
+        }
+
+        if 'streamGenerateContent' not in request.match_info['model_action']:
+            return web.json_response(chunk)
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        await response.write(f"data: {json.dumps(chunk)}\r\n\r\n".encode())
+        await response.write_eof()
+        return response
+
+    async def handle_page(self, request: web.Request) -> web.Response:
+        page = self.pages.get(request.path)
+        if not page:
+            return web.Response(status=404, text="Not found")
+
+        if not await self.simulate('pages'):
+            return web.Response(status=503, text="Service unavailable")
+
+        etag = f'"{zlib.crc32(request.path.encode()):08x}"'
+        if request.headers.get('If-None-Match') == etag:
+            with self._lock:
+                self.counters['not_modified'] += 1
+            return web.Response(status=304, headers={'ETag': etag})
+
+        title, snippet = page
+        body = self.page_template.format(title=html.escape(title), snippet=html.escape(snippet))
+        return web.Response(
+            text=body,
+            content_type='text/html',
+            headers={'ETag': etag, 'Last-Modified': 'Tue, 14 Jan 2025 12:00:00 GMT'}
+        )
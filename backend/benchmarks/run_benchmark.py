@@ -0,0 +1,340 @@
+"""Offline end-to-end benchmark for NewsService.fetch_and_process_news.
+
+Runs the full pipeline against local fake Serper, Reddit and Gemini servers
+(see ``fake_providers.py``) at several corpus sizes and reports throughput,
+per-stage timings, peak RSS, LLM call counts and the memory the retained
+articles take in the article store compared with Pydantic models. Each corpus size runs in a
+fresh process so peak RSS is not polluted by earlier runs.
+
+Usage (from ``backend/``):
+
+    python -m benchmarks.run_benchmark --save-baseline
+    python -m benchmarks.run_benchmark
+    python -m benchmarks.run_benchmark --sizes 5 10 25 --gemini-latency-ms 800
+
+No baseline is checked in: record one with ``--save-baseline`` on the
+machine you compare on, with the sentence transformer cached.
+"""
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+from benchmarks.fake_providers import FakeProviderServer, ProviderProfile
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+DEFAULT_SIZES = [5, 10, 25]
+DEFAULT_CATEGORIES = ['geopolitics', 'history', 'science', 'general', 'crime', 'market']
+
+STAGES = ['fetch_reddit', 'fetch_serper', 'enrich', 'embed', 'cluster', 'sentiment', 'summarize']
+
+
+class StageTimer:
+    """Accumulates wall time and call counts for instrumented service methods"""
+
+    def __init__(self):
+        self.seconds = {stage: 0.0 for stage in STAGES}
+        self.calls = {stage: 0 for stage in STAGES}
+        self.articles = 0
+
+    def wrap_async(self, stage: str, func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.seconds[stage] += time.perf_counter() - start
+                self.calls[stage] += 1
+        return wrapper
+
+    def wrap_sync(self, stage: str, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.seconds[stage] += time.perf_counter() - start
+                self.calls[stage] += 1
+        return wrapper
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MiB (Linux reports KiB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def instrument(news_service, timer: StageTimer):
+    """Wrap the service stages on a NewsService instance with timers"""
+    news_service.reddit_service.fetch_posts = timer.wrap_async(
+        'fetch_reddit', news_service.reddit_service.fetch_posts
+    )
+    news_service.serper_service.search_news = timer.wrap_async(
+        'fetch_serper', news_service.serper_service.search_news
+    )
+
+    news_service.enrichment_service.enrich_articles = timer.wrap_async(
+        'enrich', news_service.enrichment_service.enrich_articles
+    )
+
+    # Every new article is embedded once, whether it joins a cached cluster or not
+    embed_articles = news_service.clustering_service.embed_articles
+
+    async def counted_embed_articles(articles):
+        timer.articles += len(articles)
+        return await embed_articles(articles)
+
+    news_service.clustering_service.embed_articles = timer.wrap_async('embed', counted_embed_articles)
+    news_service.clustering_service.cluster_articles = timer.wrap_async(
+        'cluster', news_service.clustering_service.cluster_articles
+    )
+    news_service.sentiment_service.analyze_sentiment = timer.wrap_sync(
+        'sentiment', news_service.sentiment_service.analyze_sentiment
+    )
+    news_service.gemini_service.generate_summary = timer.wrap_async(
+        'summarize', news_service.gemini_service.generate_summary
+    )
+
+
+def pydantic_bytes(store) -> int:
+    """Bytes the retained clusters take as Pydantic models, the way they were cached before the article store"""
+    from app.models.news_models import NewsCluster
+
+    # Round-trip through JSON so the models own their strings instead of sharing the store's
+    payloads = [cluster.model_dump_json() for category in store.clusters for cluster in store.news_clusters(category)]
+    tracemalloc.start()
+    try:
+        models = [NewsCluster.model_validate_json(payload) for payload in payloads]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del models
+    return current
+
+
+async def run_refreshes(categories: List[str], rounds: int) -> Dict:
+    from app.services.news_service import NewsService
+
+    setup_start = time.perf_counter()
+    news_service = NewsService()
+    setup_seconds = time.perf_counter() - setup_start
+
+    timer = StageTimer()
+    instrument(news_service, timer)
+
+    # Later rounds only process items earlier rounds have not seen
+    clusters = 0
+    failed_refreshes = 0
+    rounds_s = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        round_start = time.perf_counter()
+        clusters = 0
+        for category in categories:
+            try:
+                result = await news_service.fetch_and_process_news(category)
+            except Exception:
+                failed_refreshes += 1
+                continue
+            clusters += len(result)
+        rounds_s.append(round(time.perf_counter() - round_start, 4))
+    total_seconds = time.perf_counter() - start
+    await news_service.close()
+
+    store = news_service.article_store
+    retained = sum(len(record.rows) for records in store.clusters.values() for record in records)
+
+    return {
+        'setup_s': round(setup_seconds, 4),
+        'total_s': round(total_seconds, 4),
+        'articles': timer.articles,
+        'clusters': clusters,
+        'throughput_articles_per_s': round(timer.articles / total_seconds, 2) if total_seconds else 0.0,
+        'rounds_s': rounds_s,
+        'stages_s': {stage: round(seconds, 4) for stage, seconds in timer.seconds.items()},
+        'llm_calls': timer.calls['summarize'],
+        'failed_refreshes': failed_refreshes,
+        'retained_articles': retained,
+        'store_bytes': store.nbytes(),
+        'embedding_bytes': store.table.embedding_nbytes(),
+        'pydantic_bytes': pydantic_bytes(store),
+        'clustering_model': news_service.clustering_service.model is not None,
+    }
+
+
+def run_size(environment: Dict[str, str], categories: List[str], rounds: int) -> Dict:
+    """Entry point of the per-size worker process"""
+    os.environ.update(environment)
+    logging.basicConfig(level=logging.WARNING)
+    result = asyncio.run(run_refreshes(categories, rounds))
+    result['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    return result
+
+
+def run_benchmark(args) -> Dict:
+    profile = ProviderProfile(args.latency_ms, args.jitter_ms, args.error_rate)
+    gemini_profile = ProviderProfile(
+        args.gemini_latency_ms if args.gemini_latency_ms is not None else args.latency_ms,
+        args.jitter_ms,
+        args.error_rate
+    )
+    server = FakeProviderServer(
+        profiles={'serper': profile, 'reddit': profile, 'gemini': gemini_profile, 'pages': profile},
+        seed=args.seed
+    )
+    server.start()
+
+    environment = dict(server.environment())
+    # Never reach out to the Hugging Face hub; the model must already be cached
+    environment.setdefault('HF_HUB_OFFLINE', '1')
+    environment.setdefault('TRANSFORMERS_OFFLINE', '1')
+
+    runs = {}
+    context = multiprocessing.get_context('spawn')
+    try:
+        for size in args.sizes:
+            server.serper_per_query = size
+            server.reset_counters()
+            with context.Pool(1) as pool:
+                result = pool.apply(run_size, (environment, args.categories, args.rounds))
+            result['http_requests'] = dict(server.counters)
+            runs[str(size)] = result
+            print_run(size, result)
+    finally:
+        server.stop()
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'config': {
+            'categories': args.categories,
+            'rounds': args.rounds,
+            'latency_ms': args.latency_ms,
+            'jitter_ms': args.jitter_ms,
+            'gemini_latency_ms': gemini_profile.latency_ms,
+            'error_rate': args.error_rate,
+            'seed': args.seed,
+        },
+        'runs': runs,
+    }
+
+
+def print_run(size: int, result: Dict):
+    stages = ", ".join(f"{stage}={seconds:.3f}s" for stage, seconds in result['stages_s'].items())
+    print(
+        f"size={size:<4} articles={result['articles']:<5} clusters={result['clusters']:<4} "
+        f"total={result['total_s']:.3f}s throughput={result['throughput_articles_per_s']:.1f}/s "
+        f"llm_calls={result['llm_calls']:<4} peak_rss={result['peak_rss_mb']:.0f}MiB"
+    )
+    print(f"           {stages}")
+    retained = result.get('retained_articles')
+    if retained:
+        print(
+            f"           store: {retained} articles retained, {result['store_bytes'] / retained:.0f} B/article "
+            f"({(result['store_bytes'] - result['embedding_bytes']) / retained:.0f} without embeddings) "
+            f"vs {result['pydantic_bytes'] / retained:.0f} B/article as Pydantic models without embeddings"
+        )
+    if len(result.get('rounds_s', [])) > 1:
+        print(f"           rounds: {', '.join(f'{seconds:.3f}s' for seconds in result['rounds_s'])}")
+    if result.get('failed_refreshes'):
+        print(f"           {result['failed_refreshes']} refreshes failed")
+    if not result['clustering_model']:
+        print("           (sentence transformer unavailable: clustering fell back to singletons)")
+
+
+def compare_with_baseline(report: Dict, baseline: Dict):
+    """Print relative changes against a stored baseline for matching sizes and settings"""
+    print("\nComparison with baseline:")
+    differing = sorted(
+        key for key in set(report['config']) | set(baseline.get('config', {}))
+        if report['config'].get(key) != baseline.get('config', {}).get(key)
+    )
+    if differing:
+        print(f"not comparable: settings differ from the baseline ({', '.join(differing)})")
+        return
+
+    for size, run in report['runs'].items():
+        base = baseline.get('runs', {}).get(size)
+        if not base:
+            print(f"size={size:<4} no baseline")
+            continue
+        if run['clustering_model'] != base.get('clustering_model'):
+            # Without the model, embedding and clustering are skipped entirely
+            print(f"size={size:<4} not comparable: clustering model availability differs from the baseline")
+            continue
+
+        def delta(current, previous):
+            if not previous:
+                return "n/a"
+            return f"{(current - previous) / previous * 100:+.1f}%"
+
+        print(
+            f"size={size:<4} total {delta(run['total_s'], base['total_s'])}  "
+            f"throughput {delta(run['throughput_articles_per_s'], base['throughput_articles_per_s'])}  "
+            f"peak_rss {delta(run['peak_rss_mb'], base['peak_rss_mb'])}  "
+            f"llm_calls {run['llm_calls']} vs {base['llm_calls']}"
+        )
+        stages = [
+            f"{stage} {delta(run['stages_s'][stage], base['stages_s'][stage])}"
+            for stage in STAGES if stage in run['stages_s'] and stage in base.get('stages_s', {})
+        ]
+        if stages:
+            print(f"           {', '.join(stages)}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end news pipeline benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Serper results returned per keyword query (corpus size knob)")
+    parser.add_argument('--categories', nargs='+', default=DEFAULT_CATEGORIES)
+    parser.add_argument('--rounds', type=int, default=1, help="Refreshes of every category per corpus size")
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="Base latency of every fake provider")
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--gemini-latency-ms', type=float, default=None,
+                        help="Override latency for the fake Gemini endpoint")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of provider calls that fail")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Overwrite the stored baseline")
+    parser.add_argument('--output', type=Path, help="Write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    report = run_benchmark(args)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        if not all(run['clustering_model'] for run in report['runs'].values()):
+            print("warning: recorded without the sentence transformer; runs with the model will not be compared to it")
+    elif args.baseline.exists():
+        compare_with_baseline(report, json.loads(args.baseline.read_text()))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
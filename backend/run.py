@@ -6,10 +6,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 if __name__ == "__main__":
+    workers = int(os.getenv('NEWS_WORKERS', '1'))
+
+    if workers > 1:
+        # Workers share snapshots and elect a scheduler leader via this directory
+        os.environ.setdefault('NEWS_SHARED_DIR', os.path.join(os.getcwd(), '.news_shared'))
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=workers == 1,
+        workers=workers,
         log_level="info"
     )
\ No newline at end of file
@@ -0,0 +1,42 @@
+import os
+import numpy as np
+import pytest
+
+# Tests never reach the Hugging Face hub; services that need embeddings get KeywordEncoder
+os.environ.setdefault('HF_HUB_OFFLINE', '1')
+os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+
+AXES = ['election', 'rocket', 'market']
+
+
+class KeywordEncoder:
+    """Embeds text as counts of a few fixed words, so similarity is predictable"""
+
+    def encode(self, texts):
+        return np.array([[text.lower().count(axis) + 0.01 for axis in AXES] for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def make_news_service(monkeypatch):
+    """NewsService with fake sources (``service.batch``) and a fake summarizer (``service.summaries``)"""
+    monkeypatch.setenv('ENRICHMENT_ENABLED', 'false')
+    from app.services.news_service import NewsService
+
+    def make(**kwargs):
+        service = NewsService(**kwargs)
+        service.clustering_service.model = KeywordEncoder()
+        service.batch = []
+        service.summaries = []
+
+        async def fetch_articles(category):
+            return list(service.batch)
+
+        async def generate_summary(articles, bias_analyses):
+            service.summaries.append([article.url for article in articles])
+            return {'title': articles[0].title, 'summary': 'Summary'}
+
+        service.fetch_articles = fetch_articles
+        service.gemini_service.generate_summary = generate_summary
+        return service
+
+    return make
@@ -0,0 +1,29 @@
+import asyncio
+import httpx
+import pytest
+from app import main
+from app.core.job_queue import RefreshJobQueue
+
+
+@pytest.fixture
+def api(make_news_service, monkeypatch):
+    """The FastAPI app with a fake news service and a stopped refresh queue (jobs stay queued)"""
+    service = make_news_service()
+    monkeypatch.setattr(main, 'news_service', service)
+    monkeypatch.setattr(main, 'job_queue', RefreshJobQueue(service))
+
+    async def request(method, path):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.request(method, path)
+
+    return lambda method, path: asyncio.run(asyncio.wait_for(request(method, path), 5))
+
+
+@pytest.mark.parametrize('method, path', [('GET', '/api/news/sports'), ('POST', '/api/news/sports/refresh')])
+def test_unknown_categories_are_not_queued(api, method, path):
+    response = api(method, path)
+
+    assert response.status_code == 404
+    assert 'X-Refresh-Job-Id' not in response.headers
+    assert not main.job_queue.jobs
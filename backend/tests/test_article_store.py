@@ -0,0 +1,145 @@
+from datetime import datetime
+import numpy as np
+from app.core.article_store import ArticleStore
+from app.models.news_models import BiasAnalysis, RawArticle
+
+
+def add_cluster(store, category, cluster_id, size, embed=False):
+    articles = [
+        RawArticle(
+            title=f"{cluster_id} {index}", content='', url=f"https://example.com/{cluster_id}/{index}",
+            source=f"{cluster_id}-source-{index}", source_type='serper', timestamp=datetime.now(), category=category
+        )
+        for index in range(size)
+    ]
+    bias = [
+        BiasAnalysis(source=article.source, sentiment='positive', compound=0.5, tone='neutral')
+        for article in articles
+    ]
+    embeddings = np.full((size, 4), 0.25, dtype=np.float32) if embed else None
+    return store.add_cluster(category, cluster_id, {'title': cluster_id, 'summary': ''}, articles, bias, embeddings)
+
+
+def sources(store, record):
+    return [source.name for source in store.to_news_cluster(record).articles[0].sources]
+
+
+def test_round_trip_through_api_models():
+    store = ArticleStore()
+    record = add_cluster(store, 'science', 'a', 3, embed=True)
+    store.set_clusters('science', [record])
+
+    cluster = store.news_clusters('science')[0]
+
+    assert cluster.id == 'a'
+    assert [source.name for source in cluster.articles[0].sources] == ['a-source-0', 'a-source-1', 'a-source-2']
+    assert cluster.articles[0].bias_analysis[0].compound == 0.5
+    assert store.embeddings(record).shape == (3, 4)
+
+
+def test_compaction_keeps_rows_of_unpublished_clusters():
+    store = ArticleStore()
+    store.set_clusters('a', [add_cluster(store, 'a', 'first', 1100)])
+    pending = add_cluster(store, 'b', 'pending', 3, embed=True)
+
+    # Republishing A leaves 1100 dead rows and triggers compaction
+    store.set_clusters('a', [add_cluster(store, 'a', 'second', 5)])
+
+    assert store.table.size == 8
+    assert store.table.capacity == store.table.min_capacity
+    assert store.table.embeddings.shape[0] == store.table.capacity
+    assert sources(store, pending) == ['pending-source-0', 'pending-source-1', 'pending-source-2']
+    assert store.embeddings(pending) is not None
+
+    store.set_clusters('b', [pending])
+    assert not store.pending
+    assert sources(store, store.records('b')[0])[0] == 'pending-source-0'
+
+
+def test_discarded_clusters_are_reclaimed():
+    store = ArticleStore()
+    kept = add_cluster(store, 'a', 'kept', 2)
+    dropped = add_cluster(store, 'a', 'dropped', 2000)
+    store.set_clusters('a', [kept])
+
+    store.discard([dropped, kept])
+
+    assert store.dead_rows == 2000
+    assert not store.pending
+    store.compact()
+    assert store.table.size == 2
+    assert sources(store, kept) == ['kept-source-0', 'kept-source-1']
+
+
+def test_extended_cluster_shares_rows_with_the_original():
+    store = ArticleStore()
+    original = add_cluster(store, 'a', 'story', 2, embed=True)
+    store.set_clusters('a', [original])
+
+    articles = [
+        RawArticle(title='update', content='', url='https://example.com/update', source='update-source',
+                   source_type='serper', timestamp=datetime.now(), category='a')
+    ]
+    bias = [BiasAnalysis(source='update-source', sentiment='negative', compound=-0.5, tone='neutral')]
+    extended = store.extend_cluster(original, articles, bias, np.full((1, 4), 0.5, dtype=np.float32))
+
+    assert extended.id == original.id
+    assert extended.title == original.title
+    assert sources(store, extended) == ['story-source-0', 'story-source-1', 'update-source']
+
+    # Only the replaced record is dropped; its rows live on in the extension
+    store.set_clusters('a', [extended])
+    assert store.dead_rows == 0
+
+    store.compact()
+    assert store.table.size == 3
+    assert sources(store, extended) == ['story-source-0', 'story-source-1', 'update-source']
+    assert store.embeddings(extended).shape == (3, 4)
+
+
+def test_discarding_an_extension_keeps_the_published_rows_live():
+    store = ArticleStore()
+    original = add_cluster(store, 'a', 'story', 2)
+    store.set_clusters('a', [original])
+    articles = [
+        RawArticle(title='update', content='', url='https://example.com/update', source='update-source',
+                   source_type='serper', timestamp=datetime.now(), category='a')
+    ]
+    bias = [BiasAnalysis(source='update-source', sentiment='neutral', compound=0.0, tone='neutral')]
+
+    store.discard([store.extend_cluster(original, articles, bias)])
+
+    assert store.dead_rows == 1
+
+
+def test_loading_a_snapshot_keeps_embeddings_of_known_clusters():
+    store = ArticleStore()
+    unchanged = add_cluster(store, 'a', 'unchanged', 2, embed=True)
+    extended = add_cluster(store, 'a', 'extended', 2, embed=True)
+    store.set_clusters('a', [unchanged, extended])
+
+    # Another worker appended an article to 'extended'
+    snapshot = store.news_clusters('a')
+    snapshot[1].articles[0].sources.append(snapshot[1].articles[0].sources[0].model_copy(
+        update={'name': 'other', 'url': 'https://example.com/other'}
+    ))
+    snapshot[1].articles[0].bias_analysis.append(snapshot[1].articles[0].bias_analysis[0])
+    store.load_news_clusters('a', snapshot)
+
+    records = store.records('a')
+    assert records[0] is unchanged
+    assert store.embeddings(records[1]) is None
+    assert store.table.has_embedding[records[1].rows].tolist() == [True, True, False]
+    assert np.allclose(store.centroid(records[1]), 0.25)
+
+
+def test_nbytes_counts_urls_and_records():
+    store = ArticleStore()
+    empty = store.nbytes()
+    record = add_cluster(store, 'a', 'first', 3, embed=True)
+    store.set_clusters('a', [record])
+
+    columns = sum(getattr(store.table, name).nbytes for name in store.table.COLUMNS)
+    strings = sum(len(url) for url in store.table.urls) + len(record.title)
+    assert store.nbytes() - empty > store.table.embedding_nbytes() + strings
+    assert store.table.nbytes() > columns + store.table.embedding_nbytes() + strings
@@ -0,0 +1,113 @@
+import math
+import random
+import time
+from datetime import datetime, timedelta
+import pytest
+from app.models.news_models import BiasAnalysis
+from app.services import bias_stats_service
+from app.services.bias_stats_service import BUCKET_SECONDS, BiasStatsService, RunningStats
+
+
+def analysis(source, compound):
+    sentiment = 'positive' if compound > 0.05 else 'negative' if compound < -0.05 else 'neutral'
+    return BiasAnalysis(source=source, sentiment=sentiment, compound=compound, tone='neutral')
+
+
+def stats_of(values):
+    stats = RunningStats()
+    for value in values:
+        stats.add(value, 'neutral')
+    return stats
+
+
+def test_running_stats_match_sample_mean_and_stddev():
+    values = [0.5, -0.2, 0.9, 0.1, -0.7]
+    stats = stats_of(values)
+    mean = sum(values) / len(values)
+
+    assert stats.mean == pytest.approx(mean)
+    assert stats.stddev == pytest.approx(math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1)))
+
+
+def test_subtract_is_the_inverse_of_merging():
+    rng = random.Random(7)
+    head = [rng.uniform(-1, 1) for _ in range(40)]
+    tail = [rng.uniform(-1, 1) for _ in range(25)]
+    total = stats_of(head + tail)
+
+    total.subtract(stats_of(head))
+    expected = stats_of(tail)
+
+    assert total.count == expected.count
+    assert total.mean == pytest.approx(expected.mean)
+    assert total.stddev == pytest.approx(expected.stddev)
+    assert total.neutral == 25
+
+
+def test_subtracting_everything_resets():
+    total = stats_of([0.1, 0.2])
+    total.subtract(stats_of([0.1, 0.2]))
+    assert (total.count, total.mean, total.m2, total.neutral) == (0, 0.0, 0.0, 0)
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock(time.time())
+    monkeypatch.setattr(bias_stats_service.time, 'time', fake.time)
+    return fake
+
+
+def test_report_aggregates_per_source_and_category(clock):
+    service = BiasStatsService()
+    service.record('general', analysis('AP', 0.5))
+    service.record('general', analysis('AP', -0.5))
+    service.record('science', analysis('BBC', 0.2))
+
+    report = service.report('day')
+
+    assert [(item.name, item.count) for item in report.sources] == [('AP', 2), ('BBC', 1)]
+    assert report.sources[0].mean_compound == 0.0
+    assert report.sources[0].positive == report.sources[0].negative == 1
+    assert [(item.name, item.count) for item in report.categories] == [('general', 2), ('science', 1)]
+    assert [item.name for item in service.report('day', source='BBC').sources] == ['BBC']
+    assert service.report('day', source='Nobody').sources == []
+
+
+def test_scores_expire_from_the_day_window_but_not_the_week(clock):
+    service = BiasStatsService()
+    service.record('general', analysis('AP', 0.5))
+
+    clock.now += 25 * BUCKET_SECONDS
+    service.record('general', analysis('AP', -0.3))
+
+    day = service.report('day').sources[0]
+    assert (day.count, day.mean_compound) == (1, -0.3)
+    assert service.report('week').sources[0].count == 2
+
+
+def test_windows_expire_after_a_long_idle_period(clock):
+    service = BiasStatsService()
+    service.record('general', analysis('AP', 0.5))
+
+    clock.now += 30 * 24 * BUCKET_SECONDS
+
+    assert service.report('week').sources == []
+    assert service.buckets == {}
+
+
+def test_old_publish_times_only_count_in_windows_covering_them(clock):
+    service = BiasStatsService()
+    published = datetime.fromtimestamp(clock.now) - timedelta(days=3)
+
+    service.record('general', analysis('AP', 0.5), published)
+
+    assert service.report('day').sources == []
+    assert service.report('week').sources[0].count == 1
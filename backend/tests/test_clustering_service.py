@@ -0,0 +1,26 @@
+import numpy as np
+from app.services.clustering_service import ClusteringService
+
+
+def make_service(eps=0.5):
+    # Skip loading the sentence transformer; assignment only needs eps
+    service = ClusteringService.__new__(ClusteringService)
+    service.model = None
+    service.eps = eps
+    return service
+
+
+def test_assign_to_nearest_centroid_within_eps():
+    centroids = np.array([[1.0, 0.0], [0.0, 2.0]], dtype=np.float32)
+    embeddings = np.array([[3.0, 0.1], [0.1, 1.0], [1.0, 1.0]], dtype=np.float32)
+
+    labels = make_service(eps=0.2).assign_to_clusters(embeddings, centroids)
+
+    # The diagonal vector is ~0.29 in cosine distance from both centroids
+    assert labels.tolist() == [0, 1, -1]
+    assert make_service(eps=0.5).assign_to_clusters(embeddings, centroids).tolist()[2] in (0, 1)
+
+
+def test_zero_vectors_are_not_assigned():
+    labels = make_service().assign_to_clusters(np.zeros((1, 2), dtype=np.float32), np.eye(2, dtype=np.float32))
+    assert labels.tolist() == [-1]
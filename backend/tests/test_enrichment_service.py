@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from app.models.news_models import RawArticle
+from app.services.enrichment_service import EnrichmentService
+
+BODY = "The committee published its findings on Tuesday after a year of hearings. " * 2
+SIDEBAR = "Read more stories from our award-winning newsroom and subscribe today. " * 2
+
+
+def page(body: str) -> bytes:
+    return f"<html><head><title>Story</title><script>var tracking = 1;</script></head><body>{body}</body></html>".encode()
+
+
+def test_extract_prefers_the_article_element():
+    html = page(
+        f"<div class='sidebar'><p>{SIDEBAR}</p><p>{SIDEBAR}</p><p>{SIDEBAR}</p></div>"
+        f"<article><h1>Findings</h1><p>{BODY}</p><p>Too short.</p></article>"
+    )
+
+    assert EnrichmentService().extract_main_text(html) == BODY.strip()
+
+
+def test_extract_picks_the_densest_parent_and_strips_boilerplate():
+    html = page(
+        f"<nav><p>{SIDEBAR * 6}</p></nav>"
+        f"<div class='teaser'><p>{SIDEBAR}</p></div>"
+        f"<div class='story'><p>{BODY}</p><p>{BODY}</p><aside><p>{SIDEBAR}</p></aside></div>"
+        f"<footer><p>{SIDEBAR * 6}</p></footer>"
+    )
+
+    assert EnrichmentService().extract_main_text(html) == f"{BODY.strip()}\n{BODY.strip()}"
+
+
+def test_extract_handles_pages_without_paragraphs():
+    service = EnrichmentService()
+
+    assert service.extract_main_text(b"") == ""
+    assert service.extract_main_text(page("<p>Short.</p>")) == ""
+
+
+def test_canonical_url_drops_tracking_params():
+    service = EnrichmentService()
+    canonical = service.canonical_url('https://Example.com/news/story/?b=2&utm_source=feed&a=1&fbclid=x#comments')
+
+    assert canonical == 'https://example.com/news/story?a=1&b=2'
+    assert service.canonical_url('https://example.com/news/story?a=1&gclid=y&b=2') == canonical
+    assert service.canonical_url('https://example.com/') == 'https://example.com/'
+
+
+def test_cached_pages_are_revalidated_with_their_etag(monkeypatch):
+    monkeypatch.setenv('ENRICHMENT_HOST_DELAY', '0')
+    requests = []
+
+    async def handle(request):
+        requests.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304, headers={'ETag': '"v1"'})
+        return web.Response(body=page(f"<article><p>{BODY}</p></article>"),
+                            content_type='text/html', headers={'ETag': '"v1"'})
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get('/story', handle)
+        server = TestServer(app, host='127.0.0.1')
+        await server.start_server()
+        url = str(server.make_url('/story?utm_medium=social'))
+        service = EnrichmentService()
+
+        def article():
+            return RawArticle(title='Findings', content='snippet', url=url, source='AP',
+                              source_type='news', timestamp=datetime.now(), category='general')
+
+        try:
+            fetched = (await service.enrich_articles([article()]))[0].content
+            fresh = (await service.enrich_articles([article()]))[0].content
+
+            # Once the cached copy is older than revalidate_after, a conditional GET is sent
+            for cached in service.cache.values():
+                cached.fetched_at -= service.revalidate_after + 1
+            revalidated = (await service.enrich_articles([article()]))[0].content
+        finally:
+            await server.close()
+        return fetched, fresh, revalidated
+
+    fetched, fresh, revalidated = asyncio.run(scenario())
+
+    assert fetched == fresh == revalidated == BODY.strip()
+    assert requests == [None, '"v1"']
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+import pytest
+from app.core.ingestion import IngestionTracker
+from app.models.news_models import RawArticle
+from app.services.serper_service import SerperService
+
+
+def article(url, age=timedelta(hours=1), source='Reuters', external_id=None):
+    return RawArticle(
+        title=url, content='', url=url, source=source, source_type='serper',
+        timestamp=datetime.now() - age, category='general', external_id=external_id
+    )
+
+
+def test_select_delta_skips_committed_and_stale_items():
+    tracker = IngestionTracker(timedelta(hours=24))
+    first = [article('a'), article('b'), article('stale', age=timedelta(days=2))]
+
+    delta = tracker.select_delta('general', first)
+    assert [item.url for item in delta] == ['a', 'b']
+
+    tracker.commit('general', delta[:1])
+    assert [item.url for item in tracker.select_delta('general', first + [article('c')])] == ['b', 'c']
+
+
+def test_seen_items_are_tracked_per_category_and_source():
+    tracker = IngestionTracker(timedelta(hours=24))
+    tracker.commit('general', [article('a')])
+
+    assert tracker.select_delta('science', [article('a')])
+    assert tracker.select_delta('general', [article('a', source='AP')])
+    assert not tracker.select_delta('general', [article('a')])
+
+
+def test_external_id_takes_precedence_and_duplicates_are_dropped():
+    tracker = IngestionTracker(timedelta(hours=24))
+    posts = [article('https://x', external_id='t3_1'), article('https://x', external_id='t3_2'),
+             article('https://y', external_id='t3_1')]
+
+    assert [item.external_id for item in tracker.select_delta('general', posts)] == ['t3_1', 't3_2']
+
+
+def test_commit_prunes_items_outside_the_window():
+    tracker = IngestionTracker(timedelta(hours=24))
+    tracker.commit('general', [article('old', age=timedelta(days=3)), article('new')])
+
+    assert set(tracker.seen_items('general', 'serper:Reuters').seen) == {'new'}
+
+
+@pytest.mark.parametrize('text, age', [
+    ('3 hours ago', timedelta(hours=3)),
+    ('1 day ago', timedelta(days=1)),
+    ('an hour ago', timedelta(hours=1)),
+    ('45 mins ago', timedelta(minutes=45)),
+    ('2 weeks ago', timedelta(weeks=2)),
+])
+def test_parse_relative_dates(text, age):
+    parsed = SerperService().parse_date(text)
+    assert abs((datetime.now() - age) - parsed) < timedelta(seconds=5)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Jan 14, 2025', datetime(2025, 1, 14)),
+    ('January 14, 2025', datetime(2025, 1, 14)),
+    ('14 Jan 2025', datetime(2025, 1, 14)),
+    ('2025-01-14', datetime(2025, 1, 14)),
+    ('2025-01-14T08:30:00', datetime(2025, 1, 14, 8, 30)),
+    ('01/14/2025', datetime(2025, 1, 14)),
+])
+def test_parse_absolute_dates(text, expected):
+    assert SerperService().parse_date(text) == expected
+
+
+@pytest.mark.parametrize('text', ['', None, 'sometime last spring'])
+def test_unparseable_dates_fall_back_to_now(text):
+    assert abs(datetime.now() - SerperService().parse_date(text)) < timedelta(seconds=5)
+
+
+def test_serper_always_searches_the_past_day(monkeypatch):
+    monkeypatch.setenv('SERPER_API_KEY', 'key')
+    payloads = []
+
+    async def post(self, url, json=None, **kwargs):
+        payloads.append(json)
+        return httpx.Response(200, json={'news': [{'title': 'Vote', 'link': 'https://example.com/1',
+                                                   'source': 'AP', 'date': '2 hours ago'}]})
+
+    monkeypatch.setattr(httpx.AsyncClient, 'post', post)
+    articles = asyncio.run(SerperService().search_news(['election'], 'general'))
+
+    # Narrower windows would never refetch older items that failed to process
+    assert [payload['tbs'] for payload in payloads] == ['qdr:d']
+    assert [article.url for article in articles] == ['https://example.com/1']
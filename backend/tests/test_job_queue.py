@@ -0,0 +1,156 @@
+import asyncio
+import pytest
+from app.core.job_queue import PRIORITY_SCHEDULED, PRIORITY_USER, QueueFullError, RefreshJobQueue
+
+
+class FakeNewsService:
+    """Records refresh order; each refresh waits until released"""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+        self.release = asyncio.Event()
+
+    async def fetch_and_process_news(self, category):
+        self.calls.append(category)
+        await self.release.wait()
+        if category in self.fail:
+            raise RuntimeError(f"{category} failed")
+        return ['cluster'] * 2
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 5))
+
+
+async def started(queue, **kwargs):
+    service = FakeNewsService(**kwargs)
+    queue = RefreshJobQueue(service, **queue)
+    await queue.start()
+    return service, queue
+
+
+def test_user_jobs_run_before_scheduled_ones():
+    async def scenario():
+        service, queue = await started({'max_workers': 1})
+        blocker = await queue.submit('blocker', PRIORITY_SCHEDULED)
+        await asyncio.sleep(0)
+        scheduled = await queue.submit('science', PRIORITY_SCHEDULED)
+        user = await queue.submit('market', PRIORITY_USER)
+
+        service.release.set()
+        await asyncio.gather(blocker.done.wait(), scheduled.done.wait(), user.done.wait())
+        await queue.stop()
+        return service.calls, user
+
+    calls, user = run(scenario())
+    assert calls == ['blocker', 'market', 'science']
+    assert (user.status, user.clusters) == ('succeeded', 2)
+
+
+def test_requests_for_a_pending_category_share_the_job():
+    async def scenario():
+        service, queue = await started({'max_workers': 1})
+        blocker = await queue.submit('blocker', PRIORITY_USER)
+        await asyncio.sleep(0)
+        scheduled = await queue.submit('science', PRIORITY_SCHEDULED)
+        other = await queue.submit('market', PRIORITY_USER)
+        upgraded = await queue.submit('science', PRIORITY_USER)
+
+        service.release.set()
+        await asyncio.gather(blocker.done.wait(), scheduled.done.wait(), other.done.wait())
+        await queue.stop()
+        return service.calls, scheduled, upgraded
+
+    calls, scheduled, upgraded = run(scenario())
+    assert upgraded is scheduled
+    assert scheduled.to_status().priority == 'user'
+    # The upgraded job runs once, after the user job queued before it
+    assert calls == ['blocker', 'market', 'science']
+
+
+def test_recent_successes_are_debounced():
+    async def scenario():
+        service, queue = await started({'debounce_seconds': 60})
+        service.release.set()
+        first = await queue.submit('science')
+        await first.done.wait()
+        second = await queue.submit('science')
+        await queue.stop()
+        return service.calls, first, second
+
+    calls, first, second = run(scenario())
+    assert second is first
+    assert calls == ['science']
+
+
+def test_failures_are_reported_and_not_debounced():
+    async def scenario():
+        service, queue = await started({'debounce_seconds': 60}, fail={'science'})
+        service.release.set()
+        first = await queue.submit('science')
+        await first.done.wait()
+        retry = await queue.submit('science')
+        await retry.done.wait()
+        await queue.stop()
+        return service.calls, first, retry
+
+    calls, first, retry = run(scenario())
+    assert first.status == 'failed'
+    assert first.error == 'science failed'
+    assert retry is not first
+    assert calls == ['science', 'science']
+
+
+def test_full_queue_rejects_with_retry_after():
+    async def scenario():
+        service, queue = await started({'max_workers': 1, 'max_queued': 1})
+        running = await queue.submit('blocker')
+        await asyncio.sleep(0)
+        await queue.submit('science')
+        with pytest.raises(QueueFullError) as error:
+            await queue.submit('market')
+        # Coalescing onto a queued job still works when the queue is full
+        assert (await queue.submit('science')).category == 'science'
+
+        service.release.set()
+        await running.done.wait()
+        await queue.stop()
+        return error.value
+
+    error = run(scenario())
+    assert error.retry_after >= 1
+
+
+def test_jobs_can_be_looked_up_until_evicted():
+    async def scenario():
+        service, queue = await started({'max_finished_jobs': 2, 'debounce_seconds': 0})
+        service.release.set()
+        jobs = []
+        for category in ('a', 'b', 'c'):
+            job = await queue.submit(category)
+            await job.done.wait()
+            jobs.append(job)
+        await queue.stop()
+        return queue, jobs
+
+    queue, jobs = run(scenario())
+    assert queue.get(jobs[0].id) is None
+    assert queue.get(jobs[2].id).to_status().status == 'succeeded'
+
+
+def test_stopping_fails_queued_and_running_jobs():
+    async def scenario():
+        service, queue = await started({'max_workers': 1})
+        running = await queue.submit('science')
+        await asyncio.sleep(0)
+        queued = await queue.submit('market')
+
+        await queue.stop()
+        await asyncio.gather(running.done.wait(), queued.done.wait())
+        return queue, running, queued
+
+    queue, running, queued = run(scenario())
+    assert (running.status, running.error) == ('failed', 'Cancelled')
+    assert (queued.status, queued.error) == ('failed', 'Refresh queue stopped')
+    assert not queue.pending
@@ -0,0 +1,90 @@
+import asyncio
+import subprocess
+import sys
+import textwrap
+from app.core.leader import FileLock, LeaderElection
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / 'refresh.lock')
+    first, second = FileLock(path), FileLock(path)
+
+    assert first.try_acquire()
+    assert first.try_acquire()  # re-entrant for the holder
+    assert not second.try_acquire()
+
+    first.release()
+    assert second.try_acquire()
+    second.release()
+
+
+def test_context_manager_waits_for_the_holder(tmp_path):
+    path = str(tmp_path / 'refresh.lock')
+
+    async def scenario():
+        holder = FileLock(path)
+        holder.try_acquire()
+        order = []
+
+        async def waiter():
+            async with FileLock(path):
+                order.append('waiter')
+
+        task = asyncio.create_task(waiter())
+        await asyncio.sleep(0.05)
+        order.append('holder released')
+        holder.release()
+        await asyncio.wait_for(task, 2)
+        return order
+
+    assert asyncio.run(scenario()) == ['holder released', 'waiter']
+
+
+def test_lock_is_released_when_the_holder_process_dies(tmp_path):
+    path = str(tmp_path / 'refresh.lock')
+    holder = subprocess.Popen([sys.executable, '-c', textwrap.dedent(f"""
+        import sys, time
+        from app.core.leader import FileLock
+        FileLock({path!r}).try_acquire()
+        print('locked', flush=True)
+        time.sleep(60)
+    """)], stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == 'locked'
+        assert not FileLock(path).try_acquire()
+    finally:
+        holder.kill()
+        holder.wait()
+
+    assert FileLock(path).try_acquire()
+
+
+def test_follower_takes_over_when_the_leader_stops(tmp_path):
+    path = str(tmp_path / 'leader.lock')
+
+    async def scenario():
+        elected = []
+
+        def election(name):
+            async def on_elected():
+                elected.append(name)
+            return LeaderElection(path, on_elected, retry_interval=0.01)
+
+        first, second = election('first'), election('second')
+        await first.start()
+        await asyncio.sleep(0.05)
+        await second.start()
+        await asyncio.sleep(0.05)
+        state = (list(elected), first.is_leader, second.is_leader)
+
+        await first.stop()
+        for _ in range(100):
+            if second.is_leader:
+                break
+            await asyncio.sleep(0.01)
+        await second.stop()
+        return state, elected
+
+    state, elected = asyncio.run(scenario())
+    assert state == (['first'], True, False)
+    assert elected == ['first', 'second']
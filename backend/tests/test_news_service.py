@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timedelta
+from app.core.shared_store import SharedSnapshotStore
+from app.models.news_models import RawArticle
+
+
+def article(url, title, source='Reuters', source_type='serper', age=timedelta(hours=1), external_id=None):
+    return RawArticle(
+        title=title, content=title, url=url, source=source, source_type=source_type,
+        timestamp=datetime.now() - age, category='general', external_id=external_id
+    )
+
+
+BATCH = [
+    article('https://example.com/1', 'Election results announced', source='AP'),
+    article('https://example.com/2', 'Election count continues', source='BBC'),
+    article('https://reddit.example/3', 'Rocket launch delayed', source='r/news', source_type='reddit',
+            external_id='t3_abc'),
+]
+
+
+def counts(service, window):
+    return {item.name: item.count for item in service.bias_stats_service.report(window).sources}
+
+
+def test_follower_does_not_reprocess_items_from_a_snapshot(tmp_path, make_news_service):
+    async def scenario():
+        path = str(tmp_path / 'snapshots.sqlite3')
+        leader = make_news_service(snapshot_store=SharedSnapshotStore(path), lock_dir=str(tmp_path))
+        follower = make_news_service(snapshot_store=SharedSnapshotStore(path), lock_dir=str(tmp_path))
+        leader.batch = follower.batch = BATCH
+
+        published = await leader.run_pipeline('general')
+        follower.apply_snapshot('general', *follower.snapshot_store.read_snapshot('general'))
+
+        # The follower later wins the refresh lock; the same items come back from the sources
+        refreshed = await follower.run_pipeline('general')
+
+        for service in (leader, follower):
+            await service.snapshot_store.close()
+            await service.close()
+        return leader, follower, published, refreshed
+
+    leader, follower, published, refreshed = asyncio.run(scenario())
+
+    assert follower.summaries == []
+    assert [cluster.id for cluster in refreshed] == [cluster.id for cluster in published]
+    assert counts(follower, 'day') == counts(leader, 'day') == {'AP': 1, 'BBC': 1, 'r/news': 1}
+
+
+def test_follower_buckets_snapshot_scores_by_publish_time(tmp_path, make_news_service, monkeypatch):
+    monkeypatch.setenv('NEWS_FRESHNESS_HOURS', '72')
+
+    async def scenario():
+        path = str(tmp_path / 'snapshots.sqlite3')
+        leader = make_news_service(snapshot_store=SharedSnapshotStore(path), lock_dir=str(tmp_path))
+        follower = make_news_service(snapshot_store=SharedSnapshotStore(path), lock_dir=str(tmp_path))
+        leader.batch = [article('https://example.com/old', 'Market slump', source='FT', age=timedelta(days=2))]
+
+        await leader.run_pipeline('general')
+        follower.apply_snapshot('general', *follower.snapshot_store.read_snapshot('general'))
+
+        for service in (leader, follower):
+            await service.snapshot_store.close()
+            await service.close()
+        return leader, follower
+
+    leader, follower = asyncio.run(scenario())
+
+    # Published two days ago: outside the day window on both workers, inside the week
+    assert counts(leader, 'day') == counts(follower, 'day') == {}
+    assert counts(leader, 'week') == counts(follower, 'week') == {'FT': 1}
+
+
+def test_follower_reindexes_clusters_extended_by_the_leader(tmp_path, make_news_service):
+    async def scenario():
+        path = str(tmp_path / 'snapshots.sqlite3')
+        leader = make_news_service(snapshot_store=SharedSnapshotStore(path), lock_dir=str(tmp_path))
+        follower = make_news_service(snapshot_store=SharedSnapshotStore(path), lock_dir=str(tmp_path))
+        leader.batch = BATCH[:2]
+
+        await leader.run_pipeline('general')
+        follower.apply_snapshot('general', *follower.snapshot_store.read_snapshot('general'))
+        before = follower.search_service.search('election')
+
+        leader.batch = BATCH[:2] + [article('https://example.com/4', 'Election recount ordered', source='NPR')]
+        await leader.run_pipeline('general')
+        follower.apply_snapshot('general', *follower.snapshot_store.read_snapshot('general'))
+        after = follower.search_service.search('election')
+
+        for service in (leader, follower):
+            await service.snapshot_store.close()
+            await service.close()
+        return before, after
+
+    before, after = asyncio.run(scenario())
+
+    assert [result.cluster_id for result in after] == [result.cluster_id for result in before]
+    assert {source.name for source in before[0].sources} == {'AP', 'BBC'}
+    assert {source.name for source in after[0].sources} == {'AP', 'BBC', 'NPR'}
+
+
+def test_items_that_failed_are_retried_by_the_next_refresh(make_news_service):
+    async def scenario():
+        service = make_news_service()
+        service.batch = BATCH[:2]
+        summarize = service.gemini_service.generate_summary
+
+        async def unavailable(articles, bias_analyses):
+            raise RuntimeError('quota exceeded')
+
+        service.gemini_service.generate_summary = unavailable
+        try:
+            await service.run_pipeline('general')
+        except Exception:
+            pass
+
+        # Retried even though the failed refresh was moments ago
+        service.gemini_service.generate_summary = summarize
+        clusters = await service.run_pipeline('general')
+        await service.close()
+        return service, clusters
+
+    service, clusters = asyncio.run(scenario())
+
+    assert service.summaries == [['https://example.com/1', 'https://example.com/2']]
+    assert len(clusters) == 1
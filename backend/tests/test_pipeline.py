@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+from app.models.news_models import RawArticle
+from app.pipeline import CategoryCheckpoint, dedup_articles, load_input, process_category
+
+
+def article(url, title, category='general', source='Reuters'):
+    return RawArticle(
+        title=title, content=title, url=url, source=source, source_type='serper',
+        timestamp=datetime.now() - timedelta(hours=1), category=category
+    )
+
+
+INPUT = [
+    article('https://example.com/1', 'Election results announced', source='AP'),
+    article('https://example.com/2', 'Election count continues', source='BBC'),
+    article('https://example.com/3', 'Rocket launch delayed', source='NASA'),
+    article('https://example.com/4', 'Rocket engine tested', source='ESA'),
+]
+
+
+def test_dedup_drops_repeated_urls_and_titles():
+    articles = [
+        article('https://example.com/a?utm_source=x', 'Vote count'),
+        article('https://example.com/a', 'Another headline'),
+        article('https://example.com/b', '  VOTE   count '),
+        article('https://example.com/c', 'Different story'),
+    ]
+
+    unique = dedup_articles(articles, lambda url: url.split('?')[0])
+
+    assert [item.url for item in unique] == ['https://example.com/a?utm_source=x', 'https://example.com/c']
+
+
+def test_load_input_groups_by_category_and_skips_invalid_records(tmp_path, caplog):
+    path = tmp_path / 'articles.jsonl'
+    lines = [
+        INPUT[0].model_dump_json(),
+        article('https://example.com/5', 'Shares slide', category='market').model_dump_json(),
+        article('https://example.com/6', 'Vases found', category='history').model_dump_json(),
+        json.dumps({'title': 'no url'}),
+        '{not json',
+    ]
+    path.write_text("\n".join(lines) + "\n")
+
+    grouped = load_input(str(path), ['general', 'market', 'science'])
+
+    assert {category: len(items) for category, items in grouped.items()} == {'general': 1, 'market': 1, 'science': 0}
+    assert 'No input articles for science' in caplog.text
+
+
+def test_interrupted_categories_resume_from_their_checkpoint(tmp_path, make_news_service):
+    checkpoint_dir = str(tmp_path)
+    inputs = [item.model_dump(mode='json') for item in INPUT]
+
+    async def scenario():
+        service = make_news_service()
+        embed_articles = service.clustering_service.embed_articles
+        embedded = []
+
+        async def counted_embed_articles(articles):
+            embedded.append(len(articles))
+            return await embed_articles(articles)
+
+        service.clustering_service.embed_articles = counted_embed_articles
+        summarize = service.gemini_service.generate_summary
+
+        async def rocket_unavailable(articles, bias_analyses):
+            if 'Rocket' in articles[0].title:
+                raise RuntimeError('quota exceeded')
+            return await summarize(articles, bias_analyses)
+
+        service.gemini_service.generate_summary = rocket_unavailable
+        first = await process_category(service, 'general', inputs, checkpoint_dir, enrich=False)
+
+        # Interrupted after embedding: the checkpointed embeddings are reused
+        os.remove(CategoryCheckpoint(checkpoint_dir, 'general').groups_path)
+        service.gemini_service.generate_summary = summarize
+        resumed = await process_category(service, 'general', None, checkpoint_dir, enrich=False)
+        await service.close()
+        return service, embedded, first, resumed
+
+    service, embedded, first, resumed = asyncio.run(scenario())
+
+    assert (len(first['clusters']), first['pending']) == (1, 1)
+    assert (len(resumed['clusters']), resumed['pending']) == (2, 0)
+    assert resumed['clusters'][0] == first['clusters'][0]
+    assert embedded == [4]
+    assert service.summaries == [
+        ['https://example.com/1', 'https://example.com/2'],
+        ['https://example.com/3', 'https://example.com/4'],
+    ]
@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+from app.core.article_store import ArticleStore
+from app.models.news_models import BiasAnalysis, RawArticle
+from app.services.search_service import SearchService, tokenize
+from tests.conftest import KeywordEncoder
+
+def add_cluster(store, cluster_id, title, summary='', category='general', sources=('Reuters',),
+                created_at=None, embed=False):
+    articles = [
+        RawArticle(
+            title=title, content=summary, url=f"https://example.com/{cluster_id}/{index}",
+            source=source, source_type='serper', timestamp=created_at or datetime.now(), category=category
+        )
+        for index, source in enumerate(sources)
+    ]
+    bias = [BiasAnalysis(source=source, sentiment='neutral', compound=0.0, tone='neutral') for source in sources]
+    embeddings = KeywordEncoder().encode([f"{title} {summary}"] * len(sources)) if embed else None
+    return store.add_cluster(category, cluster_id, {'title': title, 'summary': summary}, articles, bias,
+                             embeddings, created_at=created_at)
+
+
+def make_service(model=None, days=7):
+    return SearchService(SimpleNamespace(model=model), timedelta(days=days))
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("The Election, in 2024!") == ['election', '2024']
+
+
+def test_bm25_ranks_title_matches_first():
+    store = ArticleStore()
+    search = make_service()
+    records = [
+        add_cluster(store, 'a', 'Rocket launch delayed', 'The election was not mentioned'),
+        add_cluster(store, 'b', 'Election results announced', 'Votes were counted overnight'),
+        add_cluster(store, 'c', 'Market rally continues', 'Stocks rose'),
+    ]
+    search.index_clusters(store, records)
+
+    results = search.search('election')
+
+    assert [result.cluster_id for result in results] == ['b', 'a']
+    assert results[0].sources[0].name == 'Reuters'
+
+
+def test_fusion_combines_keyword_and_vector_ranks():
+    store = ArticleStore()
+    search = make_service(model=KeywordEncoder())
+    records = [
+        add_cluster(store, 'keyword', 'Rocket news', 'rocket rocket rocket', embed=True),
+        add_cluster(store, 'both', 'Rocket launch', 'A rocket carried a satellite', embed=True),
+        add_cluster(store, 'vector', 'Orbital update', 'rocket', embed=True),
+    ]
+    search.index_clusters(store, records)
+
+    results = search.search('rocket launch')
+
+    # 'both' is first for BM25 (title match on both terms) and ties on the vector side
+    assert results[0].cluster_id == 'both'
+    assert {result.cluster_id for result in results} == {'keyword', 'both', 'vector'}
+    assert all(results[i].score >= results[i + 1].score for i in range(len(results) - 1))
+
+
+def test_vector_search_finds_clusters_without_keyword_overlap():
+    store = ArticleStore()
+    search = make_service(model=KeywordEncoder())
+    search.index_clusters(store, [
+        add_cluster(store, 'rocket', 'Launch window opens', 'rocket', embed=True),
+        add_cluster(store, 'market', 'Shares slide', 'market', embed=True),
+    ])
+
+    results = search.search('rocket', limit=1)
+
+    assert [result.cluster_id for result in results] == ['rocket']
+
+
+def test_unrelated_vector_hits_are_not_fused():
+    store = ArticleStore()
+    search = make_service(model=KeywordEncoder())
+    search.index_clusters(store, [
+        add_cluster(store, 'rocket', 'Launch window opens', 'rocket', embed=True),
+        add_cluster(store, 'market', 'Shares slide', 'market', embed=True),
+    ])
+
+    assert [result.cluster_id for result in search.search('rocket')] == ['rocket']
+    assert search.search('market', category='science') == []
+
+
+def test_filters_by_category_source_and_time():
+    store = ArticleStore()
+    search = make_service()
+    now = datetime.now()
+    search.index_clusters(store, [
+        add_cluster(store, 'old', 'Election recount', category='general', created_at=now - timedelta(days=2)),
+        add_cluster(store, 'new', 'Election debate', category='general', sources=('AP', 'BBC')),
+        add_cluster(store, 'geo', 'Election abroad', category='geopolitics'),
+    ])
+
+    def ids(**filters):
+        return {result.cluster_id for result in search.search('election', **filters)}
+
+    assert ids() == {'old', 'new', 'geo'}
+    assert ids(category='general') == {'old', 'new'}
+    assert ids(category='unknown') == set()
+    assert ids(source='BBC') == {'new'}
+    assert ids(source='Nobody') == set()
+    assert ids(since=now - timedelta(days=1)) == {'new', 'geo'}
+    assert ids(until=now - timedelta(days=1)) == {'old'}
+
+
+def test_reindexing_replaces_document_and_reuses_slot():
+    store = ArticleStore()
+    search = make_service()
+    search.index_clusters(store, [add_cluster(store, 'a', 'Election results'), add_cluster(store, 'b', 'Rocket')])
+    slot = search.slots['a']
+
+    search.index_clusters(store, [add_cluster(store, 'a', 'Market update')])
+
+    assert search.size == 2
+    assert search.slots['a'] == slot
+    assert 'election' not in search.postings
+    assert search.search('election') == []
+    assert [result.cluster_id for result in search.search('market')] == ['a']
+
+
+def test_removed_slots_are_reused():
+    store = ArticleStore()
+    search = make_service()
+    search.index_clusters(store, [add_cluster(store, 'a', 'Election'), add_cluster(store, 'b', 'Rocket')])
+    slot = search.slots['a']
+
+    search.remove('a')
+    search.index_clusters(store, [add_cluster(store, 'c', 'Market')])
+
+    assert search.slots['c'] == slot
+    assert len(search.documents) == 2
+    assert search.total_length == sum(search.doc_length[list(search.slots.values())])
+
+
+def test_prune_drops_clusters_outside_archive_window():
+    store = ArticleStore()
+    search = make_service(days=1)
+    search.index_clusters(store, [
+        add_cluster(store, 'old', 'Election', created_at=datetime.now() - timedelta(days=3)),
+        add_cluster(store, 'new', 'Election'),
+    ])
+
+    assert set(search.slots) == {'new'}
+    assert [result.cluster_id for result in search.search('election')] == ['new']
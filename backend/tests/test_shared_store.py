@@ -0,0 +1,82 @@
+import asyncio
+import json
+from datetime import datetime
+from app.core.shared_store import SharedSnapshotStore
+from app.models.news_models import NewsCluster, NewsSummary, SnapshotArticle
+
+
+def cluster(cluster_id, title='Election results'):
+    timestamp = datetime(2025, 1, 14, 8, 30).isoformat()
+    summary = NewsSummary(
+        id=f"{cluster_id}_summary", title=title, summary='Summary', bias_analysis=[], sources=[],
+        category='general', timestamp=timestamp, cluster_id=cluster_id
+    )
+    return NewsCluster(id=cluster_id, topic=title, articles=[summary], last_updated=timestamp)
+
+
+def test_snapshots_round_trip_between_connections(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite3')
+    writer, reader = SharedSnapshotStore(path), SharedSnapshotStore(path)
+    published = datetime(2025, 1, 14, 7, 0)
+
+    assert writer.write_snapshot('general', [cluster('a')]) == 1
+    assert writer.write_snapshot(
+        'general', [cluster('a'), cluster('b')], {'b': [SnapshotArticle(external_id='t3_x', published=published)]}
+    ) == 2
+
+    clusters, updated_at, articles = reader.read_snapshot('general')
+    assert [item.id for item in clusters] == ['a', 'b']
+    assert articles == {'b': [SnapshotArticle(external_id='t3_x', published=published)]}
+    assert updated_at > 0
+    assert reader.read_snapshot('science') is None
+
+
+def test_changed_categories_reports_other_writers_only(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite3')
+    first, second = SharedSnapshotStore(path), SharedSnapshotStore(path)
+
+    first.write_snapshot('general', [cluster('a')])
+    assert first.changed_categories() == []
+    assert second.changed_categories() == ['general']
+
+    # Nothing new until another commit, and categories already read are skipped
+    assert second.changed_categories() == []
+    second.read_snapshot('general')
+    second.write_snapshot('science', [cluster('b')])
+    first.write_snapshot('market', [cluster('c')])
+    assert second.changed_categories() == ['market']
+    assert first.changed_categories() == ['science']
+
+
+def test_reads_snapshots_written_before_per_source_fields(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite3')
+    store = SharedSnapshotStore(path)
+    store.conn.execute(
+        "INSERT INTO snapshots (category, version, updated_at, payload) VALUES (?, 1, 0, ?)",
+        ('general', json.dumps([cluster('a').model_dump(mode='json')]))
+    )
+
+    clusters, _, articles = store.read_snapshot('general')
+
+    assert [item.id for item in clusters] == ['a']
+    assert articles == {}
+
+
+def test_watch_hands_foreign_snapshots_to_the_callback(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite3')
+
+    async def scenario():
+        writer, watcher = SharedSnapshotStore(path), SharedSnapshotStore(path)
+        received = []
+        watcher.start_watching(lambda category, clusters, *_: received.append((category, len(clusters))),
+                               interval=0.01)
+        writer.write_snapshot('general', [cluster('a'), cluster('b')])
+        for _ in range(100):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        await watcher.close()
+        await writer.close()
+        return received
+
+    assert asyncio.run(scenario()) == [('general', 2)]